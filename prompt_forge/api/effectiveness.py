@@ -80,14 +80,16 @@ async def effectiveness_summary(
     """Aggregated effectiveness stats, filterable by prompt/model/agent/time."""
     cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
 
-    rows = db.select("prompt_effectiveness")
-    filtered = [r for r in rows if r.get("created_at", "") >= cutoff]
+    # Equality filters go to the database; only the time window is applied here
+    filters: dict[str, Any] = {}
     if prompt_id:
-        filtered = [r for r in filtered if r.get("prompt_id") == str(prompt_id)]
+        filters["prompt_id"] = str(prompt_id)
     if model_id:
-        filtered = [r for r in filtered if r.get("model_id") == model_id]
+        filters["model_id"] = model_id
     if agent_id:
-        filtered = [r for r in filtered if r.get("agent_id") == agent_id]
+        filters["agent_id"] = agent_id
+    rows = db.select("prompt_effectiveness", filters=filters or None)
+    filtered = [r for r in rows if r.get("created_at", "") >= cutoff]
 
     groups: dict[str, list[dict]] = {}
     for r in filtered:
@@ -171,12 +173,8 @@ async def prompt_version_effectiveness(
     prompt_id = prompts[0]["id"]
 
     cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
-    rows = db.select("prompt_effectiveness")
-    filtered = [
-        r
-        for r in rows
-        if r.get("prompt_id") == str(prompt_id) and r.get("created_at", "") >= cutoff
-    ]
+    rows = db.select("prompt_effectiveness", filters={"prompt_id": str(prompt_id)})
+    filtered = [r for r in rows if r.get("created_at", "") >= cutoff]
 
     groups: dict[str, list[dict]] = {}
     for r in filtered:
@@ -227,8 +225,7 @@ async def mission_cost_breakdown(
     db: SupabaseClient = Depends(get_supabase_client),
 ) -> dict[str, Any]:
     """Planning + execution + review cost breakdown for a mission."""
-    rows = db.select("prompt_effectiveness")
-    mission_rows = [r for r in rows if r.get("mission_id") == mission_id]
+    mission_rows = db.select("prompt_effectiveness", filters={"mission_id": mission_id})
 
     if not mission_rows:
         raise HTTPException(status_code=404, detail=f"No records for mission {mission_id}")
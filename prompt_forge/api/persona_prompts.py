@@ -2,24 +2,50 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 
 from prompt_forge.api.models import PersonaPromptCreate, PersonaPromptResponse
+from prompt_forge.db.models import PersonaPromptRow
 from prompt_forge.db.persona_store import PersonaPromptStore, get_persona_store
+from prompt_forge.utils.caching import etag_matches, make_etag
 
 router = APIRouter()
 
 
+def _not_modified(
+    prompt: PersonaPromptRow,
+    if_none_match: str | None,
+    response: Response,
+) -> Response | None:
+    """Attach caching headers; return a 304 if the client's copy is current.
+
+    Persona prompt rows are immutable apart from the is_latest flag, so
+    (persona, version, is_latest) identifies the representation.
+    """
+    headers = {
+        "Cache-Control": "no-cache",
+        "ETag": make_etag(prompt.persona, prompt.version, prompt.is_latest),
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
 @router.get("/{persona}", response_model=PersonaPromptResponse)
 async def get_persona_prompt_latest(
     persona: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     store: PersonaPromptStore = Depends(get_persona_store),
-) -> PersonaPromptResponse:
+) -> PersonaPromptResponse | Response:
     """Get the latest version of a persona prompt."""
     prompt = store.get_latest_persona_prompt(persona)
     if not prompt:
         raise HTTPException(status_code=404, detail=f"Persona '{persona}' not found")
 
+    if not_modified := _not_modified(prompt, if_none_match, response):
+        return not_modified
     return PersonaPromptResponse(**prompt.model_dump())
 
 
@@ -66,8 +92,10 @@ async def create_persona_prompt_version(
 async def get_persona_prompt_version(
     persona: str,
     version: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     store: PersonaPromptStore = Depends(get_persona_store),
-) -> PersonaPromptResponse:
+) -> PersonaPromptResponse | Response:
     """Get a specific version of a persona prompt."""
     prompt = store.get_persona_prompt_version(persona, version)
     if not prompt:
@@ -75,4 +103,6 @@ async def get_persona_prompt_version(
             status_code=404, detail=f"Persona '{persona}' version {version} not found"
         )
 
+    if not_modified := _not_modified(prompt, if_none_match, response):
+        return not_modified
     return PersonaPromptResponse(**prompt.model_dump())
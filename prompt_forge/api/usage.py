@@ -44,7 +44,11 @@ async def usage_stats(
         raise HTTPException(status_code=404, detail=f"Prompt '{slug}' not found")
 
     prompt_id = prompts[0]["id"]
-    logs = db.select("prompt_usage_log", filters={"prompt_id": prompt_id})
+    logs = db.select(
+        "prompt_usage_log",
+        filters={"prompt_id": prompt_id},
+        columns="version_id,outcome,latency_ms",
+    )
 
     total = len(logs)
     successes = sum(1 for entry in logs if entry.get("outcome") == "success")
@@ -69,8 +73,9 @@ async def all_usage_stats(
     db: SupabaseClient = Depends(get_supabase_client),
 ) -> list[dict[str, Any]]:
     """Aggregate stats per prompt (success rate, avg latency, usage count)."""
-    logs = db.select("prompt_usage_log")
-    prompts = db.select("prompts", filters={"archived": False})
+    # Project only the aggregated columns; manifests and feedback never leave the DB
+    logs = db.select("prompt_usage_log", columns="prompt_id,outcome,latency_ms")
+    prompts = db.select("prompts", filters={"archived": False}, columns="id,slug")
     prompt_map = {p["id"]: p["slug"] for p in prompts}
 
     # Group by prompt
@@ -103,8 +108,8 @@ async def top_prompts(
     db: SupabaseClient = Depends(get_supabase_client),
 ) -> list[dict[str, Any]]:
     """Most used prompts."""
-    logs = db.select("prompt_usage_log")
-    prompts = db.select("prompts", filters={"archived": False})
+    logs = db.select("prompt_usage_log", columns="prompt_id")
+    prompts = db.select("prompts", filters={"archived": False}, columns="id,slug,name,type")
     prompt_map = {p["id"]: p for p in prompts}
 
     counts: dict[str, int] = {}
@@ -139,8 +144,13 @@ async def version_performance(
         raise HTTPException(status_code=404, detail=f"Prompt '{slug}' not found")
 
     prompt_id = prompts[0]["id"]
-    logs = db.select("prompt_usage_log", filters={"prompt_id": prompt_id})
-    versions = db.select("prompt_versions", filters={"prompt_id": prompt_id})
+    logs = db.select(
+        "prompt_usage_log",
+        filters={"prompt_id": prompt_id},
+        columns="version_id,outcome,latency_ms",
+    )
+    # Version numbers only; skip the content payloads
+    versions = db.select("prompt_versions", filters={"prompt_id": prompt_id}, columns="id,version")
     version_map = {v["id"]: v["version"] for v in versions}
 
     # Group by version
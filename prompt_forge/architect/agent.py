@@ -221,9 +221,13 @@ Only output the JSON, no other text."""
             # Apply feedback as a note in constraints if LLM fails
             new_content = dict(current_content)
             sections = list(new_content.get("sections", []))
-            for s in sections:
+            for i, s in enumerate(sections):
                 if s["id"] == "constraints":
-                    s["content"] = s.get("content", "") + f"\n\nRefinement feedback: {feedback}"
+                    # Replace rather than edit the section: it belongs to the current version
+                    sections[i] = {
+                        **s,
+                        "content": s.get("content", "") + f"\n\nRefinement feedback: {feedback}",
+                    }
                     break
             else:
                 sections.append(
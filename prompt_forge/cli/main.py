@@ -41,8 +41,9 @@ def _format_table(rows: list[dict], columns: list[str]) -> str:
 @click.pass_context
 def cli(ctx: click.Context, api: str, output_format: str, token: str | None) -> None:
     """PromptForge CLI — manage prompts, versions, and compositions."""
-    ctx.ensure_object(dict)
-    ctx.obj = ForgeClient(base_url=api, auth_token=token)
+    # A caller (e.g. CliRunner.invoke(obj=...)) may inject its own client
+    if ctx.obj is None:
+        ctx.obj = ForgeClient(base_url=api, auth_token=token)
     ctx.meta["output_format"] = output_format
 
 
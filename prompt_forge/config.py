@@ -31,6 +31,9 @@ class Settings(BaseSettings):
     openclaw_gateway: str = "http://localhost:3000"
     port: int = 8400
     log_level: str = "INFO"
+    enable_nats: bool = True
+    enable_analyser: bool = True
+    enable_autonomy: bool = True
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
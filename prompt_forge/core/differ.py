@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 import json
-from difflib import SequenceMatcher
 from typing import Any
 
+from rapidfuzz.distance import Indel
+
+
+def _similarity(a: str, b: str) -> float:
+    """Bit-parallel C implementation of the 2*LCS/total-length ratio."""
+    return Indel.normalized_similarity(a, b)
+
 
 class StructuralDiffer:
     """Computes section-level diffs between prompt content versions."""
@@ -39,7 +45,7 @@ class StructuralDiffer:
                 old_text = old_section.get("content", "")
                 new_text = new_section.get("content", "")
                 if old_text != new_text:
-                    similarity = SequenceMatcher(None, old_text, new_text).ratio()
+                    similarity = _similarity(old_text, new_text)
                     changes.append(
                         {
                             "section_id": section_id,
@@ -87,18 +93,12 @@ class StructuralDiffer:
                 }
             )
 
-        # Build summary
-        added = sum(1 for c in changes if c["type"] == "added")
-        removed = sum(1 for c in changes if c["type"] == "removed")
-        modified = sum(1 for c in changes if c["type"] == "modified")
+        # Build summary: one pass over the changes tallies every type
+        counts = dict.fromkeys(("added", "removed", "modified"), 0)
+        for c in changes:
+            counts[c["type"]] += 1
 
-        parts = []
-        if added:
-            parts.append(f"{added} section(s) added")
-        if removed:
-            parts.append(f"{removed} section(s) removed")
-        if modified:
-            parts.append(f"{modified} section(s) modified")
+        parts = [f"{n} section(s) {ctype}" for ctype, n in counts.items() if n]
 
         return {
             "changes": changes,
@@ -117,23 +117,25 @@ class StructuralDiffer:
         Returns the format specified in the version-safety spec:
         changes array with field/action/from_length/to_length, and summary.
         """
-        old_keys = set(old_content.keys())
-        new_keys = set(new_content.keys())
+        # Key-view set operations: each key is hashed once, no nested membership scans
+        removed_keys = old_content.keys() - new_content.keys()
+        added_keys = new_content.keys() - old_content.keys()
+        common_keys = old_content.keys() & new_content.keys()
 
         changes: list[dict[str, Any]] = []
 
         # Removed fields
-        for key in sorted(old_keys - new_keys):
+        for key in sorted(removed_keys):
             changes.append({"field": key, "action": "removed"})
 
         # Added fields
-        for key in sorted(new_keys - old_keys):
+        for key in sorted(added_keys):
             changes.append({"field": key, "action": "added"})
 
         # Shared fields: modified or unchanged
         modified_count = 0
         unchanged_count = 0
-        for key in sorted(old_keys & new_keys):
+        for key in sorted(common_keys):
             old_val = old_content[key]
             new_val = new_content[key]
             if old_val == new_val:
@@ -151,8 +153,8 @@ class StructuralDiffer:
                 )
                 modified_count += 1
 
-        added_count = len(new_keys - old_keys)
-        removed_count = len(old_keys - new_keys)
+        added_count = len(added_keys)
+        removed_count = len(removed_keys)
 
         old_total = len(json.dumps(old_content, ensure_ascii=False))
         new_total = len(json.dumps(new_content, ensure_ascii=False))
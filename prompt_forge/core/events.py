@@ -7,12 +7,12 @@ Gracefully degrades if NATS is not available.
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
+import orjson
 import structlog
 
 logger = structlog.get_logger()
@@ -86,7 +86,7 @@ class EventPublisher:
         }
 
         try:
-            await self._nc.publish(subject, json.dumps(envelope).encode())
+            await self._nc.publish(subject, orjson.dumps(envelope, option=orjson.OPT_NON_STR_KEYS))
             logger.debug("events.published", subject=subject, type=event_type)
             return True
         except Exception as e:
@@ -5,6 +5,7 @@ from __future__ import annotations
 import base64
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
 
@@ -92,6 +93,40 @@ DATA_EXFILTRATION_PATTERNS = [
 # Sections where certain patterns are expected
 LENIENT_SECTIONS = {"persona", "identity"}
 
+# Compiled once at import and shared by every scanner. Reporting order follows the
+# pattern lists above, so the per-pattern regexes are kept alongside a single
+# alternation that rules out clean text in one pass.
+_COMPILED_PATTERNS = [
+    (name, re.compile(pattern), severity, desc)
+    for name, pattern, severity, desc in (
+        INSTRUCTION_OVERRIDE_PATTERNS + ROLE_MANIPULATION_PATTERNS + DATA_EXFILTRATION_PATTERNS
+    )
+]
+_ANY_PATTERN = re.compile("|".join(f"(?:{p.pattern})" for _, p, _, _ in _COMPILED_PATTERNS))
+
+_ZERO_WIDTH_RE = re.compile(r"[\u200b\u200c\u200d\u2060\ufeff]")
+# Only runs of 20+ base64-alphabet characters are ever decoded; the regex is the prefilter
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]{20,}={0,2}")
+_BASE64_SUSPICIOUS = ("ignore", "instructions", "system prompt", "you are now")
+
+
+@lru_cache(maxsize=1024)
+def _is_suspicious_base64(token: str) -> bool:
+    """Whether ``token`` decodes to text containing an injection keyword.
+
+    Cached because the same templates, and so the same tokens, tend to be
+    submitted for scanning again and again.
+    """
+    try:
+        decoded = base64.b64decode(token).decode("utf-8", errors="ignore").lower()
+    except Exception:
+        return False
+    return any(kw in decoded for kw in _BASE64_SUSPICIOUS)
+
+
+_CODE_BLOCK_RE = re.compile(r"```[\s\S]*?```")
+_TAG_CONTENT_RE = re.compile(r"<[^>]+>([^<]+)</[^>]+>")
+
 
 class PromptScanner:
     """Scans prompt content for injection attempts."""
@@ -146,47 +181,20 @@ class PromptScanner:
         findings: list[Finding] = []
         text_lower = text.lower()
 
-        # Check instruction override patterns
-        for name, pattern, severity, desc in INSTRUCTION_OVERRIDE_PATTERNS:
-            match = re.search(pattern, text_lower)
-            if match:
-                findings.append(
-                    Finding(
-                        pattern_name=name,
-                        matched_text=match.group(),
-                        location=location,
-                        severity=severity,
-                        description=desc,
-                    )
-                )
-
-        # Check role manipulation patterns
-        for name, pattern, severity, desc in ROLE_MANIPULATION_PATTERNS:
-            match = re.search(pattern, text_lower)
-            if match:
-                findings.append(
-                    Finding(
-                        pattern_name=name,
-                        matched_text=match.group(),
-                        location=location,
-                        severity=severity,
-                        description=desc,
-                    )
-                )
-
-        # Check data exfiltration patterns
-        for name, pattern, severity, desc in DATA_EXFILTRATION_PATTERNS:
-            match = re.search(pattern, text_lower)
-            if match:
-                findings.append(
-                    Finding(
-                        pattern_name=name,
-                        matched_text=match.group(),
-                        location=location,
-                        severity=severity,
-                        description=desc,
+        # One combined pass first; most text matches nothing
+        if _ANY_PATTERN.search(text_lower):
+            for name, pattern, severity, desc in _COMPILED_PATTERNS:
+                match = pattern.search(text_lower)
+                if match:
+                    findings.append(
+                        Finding(
+                            pattern_name=name,
+                            matched_text=match.group(),
+                            location=location,
+                            severity=severity,
+                            description=desc,
+                        )
                     )
-                )
 
         # Check for encoding tricks
         findings.extend(self._check_encoding_tricks(text, location))
@@ -201,7 +209,7 @@ class PromptScanner:
         findings: list[Finding] = []
 
         # Zero-width characters
-        zero_width = re.findall(r"[\u200b\u200c\u200d\u2060\ufeff]", text)
+        zero_width = _ZERO_WIDTH_RE.findall(text)
         if zero_width:
             findings.append(
                 Finding(
@@ -214,23 +222,18 @@ class PromptScanner:
             )
 
         # Base64-encoded blocks that decode to suspicious content
-        b64_pattern = re.findall(r"[A-Za-z0-9+/]{20,}={0,2}", text)
+        b64_pattern = _BASE64_RE.findall(text)
         for b64 in b64_pattern:
-            try:
-                decoded = base64.b64decode(b64).decode("utf-8", errors="ignore").lower()
-                suspicious_keywords = ["ignore", "instructions", "system prompt", "you are now"]
-                if any(kw in decoded for kw in suspicious_keywords):
-                    findings.append(
-                        Finding(
-                            pattern_name="base64_injection",
-                            matched_text=b64[:40] + "...",
-                            location=location,
-                            severity="high",
-                            description="Base64-encoded suspicious content detected",
-                        )
+            if _is_suspicious_base64(b64):
+                findings.append(
+                    Finding(
+                        pattern_name="base64_injection",
+                        matched_text=b64[:40] + "...",
+                        location=location,
+                        severity="high",
+                        description="Base64-encoded suspicious content detected",
                     )
-            except Exception:
-                pass
+                )
 
         return findings
 
@@ -239,7 +242,7 @@ class PromptScanner:
         findings: list[Finding] = []
 
         # Code blocks with instructions
-        code_blocks = re.findall(r"```[\s\S]*?```", text)
+        code_blocks = _CODE_BLOCK_RE.findall(text)
         for block in code_blocks:
             inner = block.strip("`").lower()
             if any(kw in inner for kw in ["ignore previous", "new instructions", "system prompt"]):
@@ -254,7 +257,7 @@ class PromptScanner:
                 )
 
         # XML/HTML tags with suspicious content
-        tag_content = re.findall(r"<[^>]+>([^<]+)</[^>]+>", text)
+        tag_content = _TAG_CONTENT_RE.findall(text)
         for content in tag_content:
             lower = content.lower()
             if any(kw in lower for kw in ["ignore previous", "new instructions", "system prompt"]):
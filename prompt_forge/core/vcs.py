@@ -84,29 +84,28 @@ def regression_check(
       - block: bool (>50% content reduction or >50% keys removed)
       - warnings: list of warning dicts for the response
     """
-    parent_keys = set(parent_content.keys())
-    new_keys = set(new_content.keys())
+    # Key-view set operations; no intermediate key sets are built
+    keys_removed = sorted(parent_content.keys() - new_content.keys())
+    keys_added = sorted(new_content.keys() - parent_content.keys())
 
-    keys_removed = sorted(parent_keys - new_keys)
-    keys_added = sorted(new_keys - parent_keys)
-
-    # Fields that went from non-empty to empty string/array
+    # Fields that went from non-empty to empty string/array, in parent order
     fields_emptied = []
-    for key in parent_keys & new_keys:
-        old_val = parent_content[key]
+    for key, old_val in parent_content.items():
+        if not old_val or key not in new_content:
+            continue
         new_val = new_content[key]
-        if old_val and not new_val:
-            if isinstance(new_val, (str, list)):
-                fields_emptied.append(key)
+        if not new_val and isinstance(new_val, (str, list)):
+            fields_emptied.append(key)
 
     parent_chars = _content_length(parent_content)
-    new_chars = _content_length(new_content)
+    # Resubmitting identical content is common; skip serialising it twice
+    new_chars = parent_chars if new_content == parent_content else _content_length(new_content)
     if parent_chars > 0 and new_chars < parent_chars:
         content_reduction_pct = round((1 - new_chars / parent_chars) * 100, 1)
     else:
         content_reduction_pct = 0.0
 
-    keys_removed_pct = (len(keys_removed) / len(parent_keys) * 100) if parent_keys else 0.0
+    keys_removed_pct = (len(keys_removed) / len(parent_content) * 100) if parent_content else 0.0
 
     # Build warnings list
     warnings: list[dict[str, Any]] = []
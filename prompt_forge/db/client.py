@@ -34,6 +34,13 @@ class SupabaseClient:
         result = self._client.table(table).insert(data).execute()
         return result.data[0]
 
+    def insert_many(self, table: str, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Insert several records in one request and return the created rows."""
+        if not data:
+            return []
+        result = self._client.table(table).insert(data).execute()
+        return result.data
+
     def select(
         self,
         table: str,
@@ -41,9 +48,14 @@ class SupabaseClient:
         order_by: str | None = None,
         ascending: bool = True,
         limit: int | None = None,
+        offset: int = 0,
+        columns: str = "*",
     ) -> list[dict[str, Any]]:
-        """Select records with optional filters, ordering, and limit."""
-        query = self._client.table(table).select("*")
+        """Select records with optional filters, ordering, paging and projection.
+
+        ``columns`` uses PostgREST select syntax, e.g. ``"id,version"``.
+        """
+        query = self._client.table(table).select(columns)
 
         if filters:
             for key, value in filters.items():
@@ -55,6 +67,9 @@ class SupabaseClient:
         if limit:
             query = query.limit(limit)
 
+        if offset:
+            query = query.offset(offset)
+
         result = query.execute()
         return result.data
 
@@ -67,6 +82,31 @@ class SupabaseClient:
         """Delete a record by ID."""
         self._client.table(table).delete().eq("id", id).execute()
 
+    def delete_before(
+        self, table: str, column: str, cutoff: str, *, include_null: bool = False
+    ) -> int:
+        """Delete records whose ``column`` is earlier than ``cutoff``.
+
+        ``lt`` never matches NULL, so pass ``include_null`` to also delete rows
+        where ``column`` is unset. Filtering happens server-side, so only the
+        deleted rows cross the wire. Returns the number of rows deleted.
+        """
+        query = self._client.table(table).delete()
+        if include_null:
+            query = query.or_(f'{column}.is.null,{column}.lt."{cutoff}"')
+        else:
+            query = query.lt(column, cutoff)
+        result = query.execute()
+        return len(result.data or [])
+
+    def rpc(self, function: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        """Call a Postgres function and return the resulting rows."""
+        result = self._client.rpc(function, params).execute()
+        data = result.data
+        if isinstance(data, dict):
+            return [data]
+        return data or []
+
 
 @lru_cache
 def get_supabase_client() -> SupabaseClient:
@@ -0,0 +1,30 @@
+-- Migration 008 — Atomic persona prompt version bump
+--
+-- Computes the next version, clears is_latest on previous rows and inserts
+-- the new row in a single transaction, so the store makes one round-trip
+-- and two concurrent bumps can never both end up as is_latest.
+
+CREATE OR REPLACE FUNCTION create_persona_version(p_persona TEXT, p_template TEXT)
+RETURNS persona_prompts AS $$
+DECLARE
+    next_version INT;
+    new_row persona_prompts;
+BEGIN
+    -- Serialise concurrent bumps for the same persona
+    PERFORM pg_advisory_xact_lock(hashtext('persona_prompts:' || p_persona));
+
+    SELECT COALESCE(MAX(version), 0) + 1 INTO next_version
+    FROM persona_prompts
+    WHERE persona = p_persona;
+
+    UPDATE persona_prompts
+    SET is_latest = FALSE
+    WHERE persona = p_persona AND is_latest = TRUE;
+
+    INSERT INTO persona_prompts (persona, version, template, is_latest)
+    VALUES (p_persona, next_version, p_template, TRUE)
+    RETURNING * INTO new_row;
+
+    RETURN new_row;
+END;
+$$ LANGUAGE plpgsql;
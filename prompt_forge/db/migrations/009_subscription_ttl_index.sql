@@ -0,0 +1,8 @@
+-- Migration 009 — Index for the subscription TTL sweep
+--
+-- remove_stale_subscriptions deletes rows with last_pulled_at older than the
+-- cutoff. last_pulled_at is a TIMESTAMPTZ, so the comparison is already a
+-- numeric one; this index turns the hourly sweep into a range scan.
+
+CREATE INDEX IF NOT EXISTS idx_subscriptions_last_pulled
+    ON prompt_subscriptions(last_pulled_at);
@@ -9,12 +9,19 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+# Rows are read-only snapshots of database records. Validation still runs on
+# construction because PostgREST returns UUIDs and timestamps as strings, but
+# instances are never re-validated or copied when nested in other models.
+ROW_CONFIG = ConfigDict(frozen=True, extra="ignore", revalidate_instances="never")
 
 
 class PromptRow(BaseModel):
     """Row from the prompts table."""
 
+    model_config = ROW_CONFIG
+
     id: UUID
     slug: str
     name: str
@@ -30,6 +37,8 @@ class PromptRow(BaseModel):
 class VersionRow(BaseModel):
     """Row from the prompt_versions table."""
 
+    model_config = ROW_CONFIG
+
     id: UUID
     prompt_id: UUID
     version: int
@@ -44,6 +53,8 @@ class VersionRow(BaseModel):
 class BranchRow(BaseModel):
     """Row from the prompt_branches table."""
 
+    model_config = ROW_CONFIG
+
     id: UUID
     prompt_id: UUID
     name: str
@@ -57,6 +68,8 @@ class BranchRow(BaseModel):
 class UsageLogRow(BaseModel):
     """Row from the prompt_usage_log table."""
 
+    model_config = ROW_CONFIG
+
     id: UUID
     prompt_id: UUID
     version_id: UUID
@@ -71,6 +84,8 @@ class UsageLogRow(BaseModel):
 class PersonaPromptRow(BaseModel):
     """Row from the persona_prompts table."""
 
+    model_config = ROW_CONFIG
+
     id: UUID
     persona: str
     version: int
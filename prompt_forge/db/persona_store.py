@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import Any
 
 import structlog
 
@@ -10,89 +13,9 @@ from prompt_forge.db.models import PersonaPromptRow
 
 logger = structlog.get_logger()
 
-
-class PersonaPromptStore:
-    """Store operations for persona prompts."""
-
-    def __init__(self, db: SupabaseClient) -> None:
-        self.db = db
-
-    def get_latest_persona_prompt(self, persona: str) -> PersonaPromptRow | None:
-        """Get the latest version of a persona prompt."""
-        rows = self.db.select(
-            "persona_prompts",
-            filters={"persona": persona, "is_latest": True},
-            limit=1,
-        )
-        if not rows:
-            return None
-        return PersonaPromptRow(**rows[0])
-
-    def get_persona_prompt_version(self, persona: str, version: int) -> PersonaPromptRow | None:
-        """Get a specific version of a persona prompt."""
-        rows = self.db.select(
-            "persona_prompts",
-            filters={"persona": persona, "version": version},
-            limit=1,
-        )
-        if not rows:
-            return None
-        return PersonaPromptRow(**rows[0])
-
-    def create_persona_prompt_version(self, persona: str, template: str) -> PersonaPromptRow:
-        """Create a new version of a persona prompt."""
-        # Get the next version number
-        existing_rows = self.db.select(
-            "persona_prompts",
-            filters={"persona": persona},
-            order_by="version",
-            ascending=False,
-            limit=1,
-        )
-        next_version = 1 if not existing_rows else existing_rows[0]["version"] + 1
-
-        # Mark all existing versions as not latest
-        if existing_rows:
-            # Update all existing versions to not be latest
-            query = (
-                self.db.client.table("persona_prompts")
-                .update({"is_latest": False})
-                .eq("persona", persona)
-            )
-            query.execute()
-
-        # Create the new version
-        data = {
-            "persona": persona,
-            "version": next_version,
-            "template": template,
-            "is_latest": True,
-        }
-
-        row_data = self.db.insert("persona_prompts", data)
-        logger.info(
-            "persona_prompt.created",
-            persona=persona,
-            version=next_version,
-            id=row_data["id"],
-        )
-
-        return PersonaPromptRow(**row_data)
-
-    def list_persona_versions(self, persona: str) -> list[PersonaPromptRow]:
-        """List all versions of a persona prompt."""
-        rows = self.db.select(
-            "persona_prompts",
-            filters={"persona": persona},
-            order_by="version",
-            ascending=False,
-        )
-        return [PersonaPromptRow(**row) for row in rows]
-
-    def seed_initial_personas(self) -> None:
-        """Seed initial personas with basic templates."""
-        initial_personas = {
-            "researcher": """You are a Researcher persona with expertise in information gathering and analysis.
+# Seed templates, built once at import rather than on every seed call
+_INITIAL_PERSONA_TEMPLATES: dict[str, str] = {
+    "researcher": """You are a Researcher persona with expertise in information gathering and analysis.
 
 Your objective: {{objective}}
 
@@ -105,7 +28,7 @@ Scope paths: {{scope_paths}}
 Alexandria context: {{alexandria_context}}
 
 Focus on thorough research, fact-checking, and providing comprehensive information with proper citations and sources.""",
-            "developer": """You are a Developer persona with expertise in software engineering and coding.
+    "developer": """You are a Developer persona with expertise in software engineering and coding.
 
 Your objective: {{objective}}
 
@@ -118,7 +41,7 @@ Scope paths: {{scope_paths}}
 Alexandria context: {{alexandria_context}}
 
 Focus on clean, efficient code, best practices, testing, and maintainable solutions. Provide working code examples and explanations.""",
-            "reviewer": """You are a Reviewer persona with expertise in code review and quality assurance.
+    "reviewer": """You are a Reviewer persona with expertise in code review and quality assurance.
 
 Your objective: {{objective}}
 
@@ -131,7 +54,7 @@ Scope paths: {{scope_paths}}
 Alexandria context: {{alexandria_context}}
 
 Focus on thorough code review, identifying issues, suggesting improvements, and ensuring quality standards are met.""",
-            "tester": """You are a Tester persona with expertise in testing strategies and quality assurance.
+    "tester": """You are a Tester persona with expertise in testing strategies and quality assurance.
 
 Your objective: {{objective}}
 
@@ -144,7 +67,7 @@ Scope paths: {{scope_paths}}
 Alexandria context: {{alexandria_context}}
 
 Focus on comprehensive testing strategies, test case design, bug identification, and ensuring software quality through rigorous testing.""",
-            "architect": """You are an Architect persona with expertise in system design and technical architecture.
+    "architect": """You are an Architect persona with expertise in system design and technical architecture.
 
 Your objective: {{objective}}
 
@@ -157,12 +80,103 @@ Scope paths: {{scope_paths}}
 Alexandria context: {{alexandria_context}}
 
 Focus on high-level system design, scalability, performance, security considerations, and architectural best practices.""",
-        }
+}
+
+
+class PersonaPromptStore:
+    """Store operations for persona prompts."""
+
+    def __init__(self, db: SupabaseClient) -> None:
+        self.db = db
+
+    def get_latest_persona_prompt(self, persona: str) -> PersonaPromptRow | None:
+        """Get the latest version of a persona prompt."""
+        rows = self.db.select(
+            "persona_prompts",
+            filters={"persona": persona, "is_latest": True},
+            limit=1,
+        )
+        if not rows:
+            return None
+        return PersonaPromptRow(**rows[0])
+
+    def get_persona_prompt_version(self, persona: str, version: int) -> PersonaPromptRow | None:
+        """Get a specific version of a persona prompt."""
+        rows = self.db.select(
+            "persona_prompts",
+            filters={"persona": persona, "version": version},
+            limit=1,
+        )
+        if not rows:
+            return None
+        return PersonaPromptRow(**rows[0])
 
-        for persona, template in initial_personas.items():
-            # Check if persona already exists
-            existing = self.get_latest_persona_prompt(persona)
-            if existing:
+    def create_persona_prompt_version(self, persona: str, template: str) -> PersonaPromptRow:
+        """Create a new version of a persona prompt.
+
+        Version numbering, clearing the previous is_latest flag and the insert
+        all happen inside the ``create_persona_version`` Postgres function
+        (migration 008), so this is a single atomic round-trip.
+        """
+        rows = self.db.rpc(
+            "create_persona_version",
+            {"p_persona": persona, "p_template": template},
+        )
+        if not rows:
+            raise ValueError(f"Failed to create version for persona '{persona}'")
+
+        row_data = rows[0]
+        logger.info(
+            "persona_prompt.created",
+            persona=persona,
+            version=row_data["version"],
+            id=row_data["id"],
+        )
+
+        return PersonaPromptRow(**row_data)
+
+    def list_persona_versions(self, persona: str) -> list[PersonaPromptRow]:
+        """List all versions of a persona prompt."""
+        return [PersonaPromptRow(**row) for row in self.iter_persona_versions(persona)]
+
+    def iter_persona_versions(
+        self,
+        persona: str,
+        *,
+        page_size: int = 100,
+        columns: str = "*",
+    ) -> Iterator[dict[str, Any]]:
+        """Yield raw version rows, newest first, fetching ``page_size`` rows per query.
+
+        Pass ``columns`` (e.g. ``"version,created_at"``) when only metadata is needed.
+        """
+        if page_size < 1:
+            # A zero limit means "no limit" to select(), so the offset would never advance
+            raise ValueError(f"page_size must be at least 1, got {page_size}")
+        offset = 0
+        while True:
+            rows = self.db.select(
+                "persona_prompts",
+                filters={"persona": persona},
+                order_by="version",
+                ascending=False,
+                limit=page_size,
+                offset=offset,
+                columns=columns,
+            )
+            yield from rows
+            if len(rows) < page_size:
+                return
+            offset += page_size
+
+    def seed_initial_personas(self) -> None:
+        """Seed initial personas with basic templates."""
+        # One query for all existing personas instead of one lookup per template
+        existing = {
+            row["persona"] for row in self.db.select("persona_prompts", filters={"is_latest": True})
+        }
+        for persona, template in _INITIAL_PERSONA_TEMPLATES.items():
+            if persona in existing:
                 logger.info("persona_prompt.seed_skip", persona=persona, reason="already_exists")
                 continue
 
@@ -171,6 +185,7 @@ Focus on high-level system design, scalability, performance, security considerat
             logger.info("persona_prompt.seeded", persona=persona)
 
 
+@lru_cache
 def get_persona_store() -> PersonaPromptStore:
-    """Get PersonaPromptStore instance."""
+    """Get cached PersonaPromptStore instance."""
     return PersonaPromptStore(get_supabase_client())
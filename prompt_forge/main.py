@@ -6,14 +6,17 @@ import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 
+import orjson
 import structlog
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from prompt_forge import __version__
 from prompt_forge.api.router import api_router
 from prompt_forge.config import get_settings
-from prompt_forge.db.client import get_supabase_client
-from prompt_forge.utils.logging import setup_logging
+from prompt_forge.db.client import SupabaseClient, get_supabase_client
+from prompt_forge.utils.caching import etag_matches, make_etag
+from prompt_forge.utils.logging import setup_logging, shutdown_logging
 
 logger = structlog.get_logger()
 
@@ -22,19 +25,28 @@ _analyser_task = None
 _autonomy_task = None
 
 
+def remove_stale_subscriptions(db: SupabaseClient, max_age: timedelta = timedelta(days=7)) -> int:
+    """Delete subscriptions not pulled within ``max_age``. Returns the number removed.
+
+    Subscriptions with no ``last_pulled_at`` at all count as stale.
+
+    Uses the blocking Supabase client, so async callers should run it in a
+    worker thread.
+    """
+    cutoff = (datetime.now(timezone.utc) - max_age).isoformat()
+    return db.delete_before("prompt_subscriptions", "last_pulled_at", cutoff, include_null=True)
+
+
 async def subscription_ttl_cleanup():
     """Background task: delete stale subscriptions every hour."""
     while True:
         try:
             await asyncio.sleep(3600)  # 1 hour
             db = get_supabase_client()
-            cutoff = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-            subs = db.select("prompt_subscriptions")
-            stale = [s for s in subs if s.get("last_pulled_at", "") < cutoff]
-            for s in stale:
-                db.delete("prompt_subscriptions", s["id"])
-            if stale:
-                logger.info("subscriptions.ttl_cleanup", removed=len(stale))
+            # Run off the event loop so the table scan doesn't stall requests
+            removed = await asyncio.to_thread(remove_stale_subscriptions, db)
+            if removed:
+                logger.info("subscriptions.ttl_cleanup", removed=removed)
         except asyncio.CancelledError:
             break
         except Exception as e:
@@ -43,7 +55,11 @@ async def subscription_ttl_cleanup():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan — startup and shutdown."""
+    """Application lifespan — startup and shutdown.
+
+    Optional NATS, analyser and autonomy modules are only imported when
+    enabled in settings, so disabled features add nothing to cold start.
+    """
     global _cleanup_task
     settings = get_settings()
     setup_logging(settings.log_level)
@@ -53,53 +69,60 @@ async def lifespan(app: FastAPI):
     get_supabase_client()
     logger.info("promptforge.supabase_connected")
 
-    # Initialize NATS event publisher (optional)
-    try:
-        from prompt_forge.core.events import get_event_publisher
+    publisher = None
+    subscriber = None
+    consumer = None
 
-        publisher = get_event_publisher()
-        await publisher.connect()
-    except Exception as e:
-        logger.info("promptforge.nats_skipped", reason=str(e))
+    if settings.enable_nats:
+        # Initialize NATS event publisher (optional)
+        try:
+            from prompt_forge.core.events import get_event_publisher
 
-    # Initialize NATS effectiveness subscribers (optional)
-    try:
-        from prompt_forge.core.subscribers import get_effectiveness_subscriber
+            publisher = get_event_publisher()
+            await publisher.connect()
+        except Exception as e:
+            logger.info("promptforge.nats_skipped", reason=str(e))
 
-        subscriber = get_effectiveness_subscriber()
-        if await subscriber.connect():
-            await subscriber.start()
-    except Exception as e:
-        logger.info("promptforge.subscribers_skipped", reason=str(e))
+        # Initialize NATS effectiveness subscribers (optional)
+        try:
+            from prompt_forge.core.subscribers import get_effectiveness_subscriber
+
+            subscriber = get_effectiveness_subscriber()
+            if await subscriber.connect():
+                await subscriber.start()
+        except Exception as e:
+            logger.info("promptforge.subscribers_skipped", reason=str(e))
 
-    # Initialize NATS refinement consumer (optional)
-    try:
-        from prompt_forge.core.refinement.consumer import get_refinement_consumer
+        # Initialize NATS refinement consumer (optional)
+        try:
+            from prompt_forge.core.refinement.consumer import get_refinement_consumer
 
-        consumer = get_refinement_consumer()
-        if await consumer.connect():
-            await consumer.start()
-    except Exception as e:
-        logger.info("promptforge.refinement_consumer_skipped", reason=str(e))
+            consumer = get_refinement_consumer()
+            if await consumer.connect():
+                await consumer.start()
+        except Exception as e:
+            logger.info("promptforge.refinement_consumer_skipped", reason=str(e))
 
     # Start TTL cleanup background task
     _cleanup_task = asyncio.create_task(subscription_ttl_cleanup())
 
     # Start analyser and autonomy background tasks
     global _analyser_task, _autonomy_task
-    try:
-        from prompt_forge.core.analyser import run_analyser_loop
+    if settings.enable_analyser:
+        try:
+            from prompt_forge.core.analyser import run_analyser_loop
 
-        _analyser_task = asyncio.create_task(run_analyser_loop())
-    except Exception as e:
-        logger.info("promptforge.analyser_skipped", reason=str(e))
+            _analyser_task = asyncio.create_task(run_analyser_loop())
+        except Exception as e:
+            logger.info("promptforge.analyser_skipped", reason=str(e))
 
-    try:
-        from prompt_forge.core.autonomy import run_autonomy_loop
+    if settings.enable_autonomy:
+        try:
+            from prompt_forge.core.autonomy import run_autonomy_loop
 
-        _autonomy_task = asyncio.create_task(run_autonomy_loop())
-    except Exception as e:
-        logger.info("promptforge.autonomy_skipped", reason=str(e))
+            _autonomy_task = asyncio.create_task(run_autonomy_loop())
+        except Exception as e:
+            logger.info("promptforge.autonomy_skipped", reason=str(e))
 
     yield
 
@@ -112,40 +135,27 @@ async def lifespan(app: FastAPI):
             except asyncio.CancelledError:
                 pass
 
-    # Disconnect NATS subscribers
-    try:
-        from prompt_forge.core.subscribers import get_effectiveness_subscriber
-
-        subscriber = get_effectiveness_subscriber()
-        await subscriber.stop()
-    except Exception:
-        pass
-
-    # Disconnect NATS refinement consumer
-    try:
-        from prompt_forge.core.refinement.consumer import get_refinement_consumer
-
-        consumer = get_refinement_consumer()
-        await consumer.stop()
-    except Exception:
-        pass
-
-    # Disconnect NATS
-    try:
-        from prompt_forge.core.events import get_event_publisher
-
-        publisher = get_event_publisher()
-        await publisher.disconnect()
-    except Exception:
-        pass
+    # Disconnect NATS subscribers, refinement consumer and publisher
+    for component in (subscriber, consumer):
+        if component:
+            try:
+                await component.stop()
+            except Exception:
+                pass
+    if publisher:
+        try:
+            await publisher.disconnect()
+        except Exception:
+            pass
 
     logger.info("promptforge.shutdown")
+    shutdown_logging()
 
 
 app = FastAPI(
     title="PromptForge",
     description="Centralised prompt lifecycle management for OpenClaw agent swarms",
-    version="0.1.0",
+    version=__version__,
     lifespan=lifespan,
 )
 
@@ -163,10 +173,22 @@ app.include_router(api_router, prefix="/api/v1")
 @app.get("/")
 async def root():
     """Service info endpoint."""
-    return {"service": "promptforge", "version": "0.1.0"}
+    return {"service": "promptforge", "version": __version__}
+
+
+# Fixed for the process lifetime, so encode once and serve the raw bytes
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "service": "promptforge", "version": __version__})
+# no-cache: proxies must revalidate every time, so a dead process or DB is never
+# masked by a cached 200; the ETag still lets them take the cheap 304 path
+_HEALTH_HEADERS = {
+    "Cache-Control": "no-cache",
+    "ETag": make_etag("health", __version__),
+}
 
 
 @app.get("/health")
-async def health():
+async def health(if_none_match: str | None = Header(default=None)):
     """Health check endpoint."""
-    return {"status": "healthy", "service": "promptforge", "version": "0.1.0"}
+    if etag_matches(if_none_match, _HEALTH_HEADERS["ETag"]):
+        return Response(status_code=304, headers=_HEALTH_HEADERS)
+    return Response(content=_HEALTH_BODY, media_type="application/json", headers=_HEALTH_HEADERS)
@@ -0,0 +1,22 @@
+"""HTTP caching helpers — ETag generation and If-None-Match matching."""
+
+from __future__ import annotations
+
+import hashlib
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from the identifying parts of a representation."""
+    digest = hashlib.sha256(":".join(str(p) for p in parts).encode()).hexdigest()[:16]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
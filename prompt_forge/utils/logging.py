@@ -1,28 +1,93 @@
-"""Structured logging configuration using structlog."""
+"""Structured logging configuration using structlog.
+
+Rendered log lines are handed to a bounded in-memory queue and written to
+stdout by a background ``QueueListener`` thread, so request handlers never
+block on the stream write.
+"""
 
 from __future__ import annotations
 
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
 
+import orjson
 import structlog
 
+LOGGER_NAME = "promptforge"
+QUEUE_SIZE = 10_000
+
+_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=QUEUE_SIZE)
+_listener: QueueListener | None = None
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of erroring when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _logger_factory(*args: object) -> logging.Logger:
+    """Return the queue-backed stdlib logger that structlog writes through."""
+    log = logging.getLogger(LOGGER_NAME)
+    if not log.handlers:
+        log.addHandler(_DroppingQueueHandler(_queue))
+        # Level filtering happens in the structlog bound logger
+        log.setLevel(logging.DEBUG)
+        log.propagate = False
+    return log
+
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """JSONRenderer serializer backed by orjson."""
+    return orjson.dumps(obj, default=kwargs.get("default")).decode()
+
 
 def setup_logging(level: str = "INFO") -> None:
     """Configure structured logging for the application."""
-    structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
+    global _listener
+    if _listener is None:
+        _listener = QueueListener(_queue, logging.StreamHandler(sys.stdout))
+        _listener.start()
+
+    numeric_level = getattr(logging, level, logging.INFO)
+
+    processors: list[Any] = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+    ]
+    # Frame/exception inspection costs on every record, so only pay for it in DEBUG
+    if numeric_level <= logging.DEBUG:
+        processors += [
             structlog.processors.StackInfoRenderer(),
             structlog.dev.set_exc_info,
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer()
-            if sys.stderr.isatty()
-            else structlog.processors.JSONRenderer(),
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, level, logging.INFO)),
+        ]
+    processors += [
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.dev.ConsoleRenderer()
+        if sys.stderr.isatty()
+        else structlog.processors.JSONRenderer(serializer=_orjson_dumps),
+    ]
+
+    structlog.configure(
+        processors=processors,
+        # Filtering bound logger drops below-level calls before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(numeric_level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=_logger_factory,
         cache_logger_on_first_use=True,
     )
+
+
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the background writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
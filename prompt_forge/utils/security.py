@@ -5,48 +5,57 @@ from __future__ import annotations
 import re
 from typing import Any
 
+import orjson
 
-# Patterns that might indicate leaked secrets
+# Patterns that might indicate leaked secrets. Compiled as bytes patterns so
+# serialised payloads can be scanned without decoding them back to str.
 SECRET_PATTERNS = [
-    re.compile(r"sk-ant-[a-zA-Z0-9-]{20,}"),  # Anthropic API key
-    re.compile(r"sk-[a-zA-Z0-9]{20,}"),  # OpenAI API key
-    re.compile(r"ghp_[a-zA-Z0-9]{36}"),  # GitHub PAT
-    re.compile(r"eyJ[a-zA-Z0-9_-]{50,}"),  # JWT tokens
-    re.compile(r"AKIA[0-9A-Z]{16}"),  # AWS access key
-    re.compile(r"xox[bporas]-[a-zA-Z0-9-]+"),  # Slack tokens
+    re.compile(rb"sk-ant-[a-zA-Z0-9-]{20,}"),  # Anthropic API key
+    re.compile(rb"sk-[a-zA-Z0-9]{20,}"),  # OpenAI API key
+    re.compile(rb"ghp_[a-zA-Z0-9]{36}"),  # GitHub PAT
+    re.compile(rb"eyJ[a-zA-Z0-9_-]{50,}"),  # JWT tokens
+    re.compile(rb"AKIA[0-9A-Z]{16}"),  # AWS access key
+    re.compile(rb"xox[bporas]-[a-zA-Z0-9-]+"),  # Slack tokens
 ]
+SECRET_PATTERN_NAMES = (
+    "Anthropic API key",
+    "OpenAI API key",
+    "GitHub PAT",
+    "JWT token",
+    "AWS access key",
+    "Slack token",
+)
+_NAMED_SECRET_PATTERNS = tuple(zip(SECRET_PATTERNS, SECRET_PATTERN_NAMES))
 
 MAX_CONTENT_SIZE = 50 * 1024  # 50KB default
-SLUG_PATTERN = re.compile(r"^[a-z0-9][a-z0-9-]*[a-z0-9]$")
+_SLUG_CHARS = b"abcdefghijklmnopqrstuvwxyz0123456789-"
 
 
-def scan_for_secrets(text: str) -> list[str]:
+def scan_for_secrets(text: str | bytes) -> list[str]:
     """Scan text for potential secrets. Returns list of detected pattern names."""
-    findings: list[str] = []
-    pattern_names = [
-        "Anthropic API key",
-        "OpenAI API key",
-        "GitHub PAT",
-        "JWT token",
-        "AWS access key",
-        "Slack token",
-    ]
-    for pattern, name in zip(SECRET_PATTERNS, pattern_names):
-        if pattern.search(text):
-            findings.append(name)
-    return findings
+    if isinstance(text, str):
+        text = text.encode()
+    return [name for pattern, name in _NAMED_SECRET_PATTERNS if pattern.search(text)]
+
+
+def _serialise(content: dict[str, Any]) -> bytes:
+    """Serialise content to compact UTF-8 JSON."""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
 
 
 def validate_content_size(content: dict[str, Any], max_bytes: int = MAX_CONTENT_SIZE) -> bool:
     """Check that serialised content doesn't exceed size limit."""
-    import json
-
-    return len(json.dumps(content).encode()) <= max_bytes
+    return len(_serialise(content)) <= max_bytes
 
 
 def validate_slug(slug: str) -> bool:
     """Validate slug format: lowercase alphanumeric with hyphens, 2-100 chars."""
-    return bool(SLUG_PATTERN.match(slug)) and 2 <= len(slug) <= 100
+    if not 2 <= len(slug) <= 100 or not slug.isascii():
+        return False
+    if slug[0] == "-" or slug[-1] == "-":
+        return False
+    # Deleting every allowed byte leaves nothing behind for a valid slug
+    return not slug.encode("ascii").translate(None, _SLUG_CHARS)
 
 
 def sanitise_content(content: dict[str, Any]) -> tuple[dict[str, Any], list[str]]:
@@ -54,16 +63,15 @@ def sanitise_content(content: dict[str, Any]) -> tuple[dict[str, Any], list[str]
 
     Returns (content, warnings).
     """
-    import json
-
     warnings: list[str] = []
 
-    text = json.dumps(content)
-    secrets = scan_for_secrets(text)
+    # Serialise once and reuse the payload for both checks
+    payload = _serialise(content)
+    secrets = scan_for_secrets(payload)
     if secrets:
         warnings.append(f"Potential secrets detected: {', '.join(secrets)}")
 
-    if not validate_content_size(content):
+    if len(payload) > MAX_CONTENT_SIZE:
         warnings.append(f"Content exceeds {MAX_CONTENT_SIZE // 1024}KB limit")
 
     return content, warnings
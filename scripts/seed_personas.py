@@ -13,6 +13,14 @@ import sys
 
 import httpx
 
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 PERSONAS = [
     {
         "slug": "researcher",
@@ -109,7 +117,13 @@ PERSONAS = [
 
 def seed_via_api(base_url: str) -> None:
     """Seed personas by POSTing to the PromptForge API."""
-    with httpx.Client(base_url=base_url, timeout=10.0) as client:
+    # One pooled connection is reused for every POST
+    with httpx.Client(
+        base_url=base_url,
+        timeout=10.0,
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+    ) as client:
         for persona in PERSONAS:
             payload = {
                 "slug": persona["slug"],
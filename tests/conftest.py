@@ -2,75 +2,176 @@
 
 from __future__ import annotations
 
+import copy
+import heapq
+import itertools
+from collections.abc import AsyncIterator, Callable, Iterator
 from datetime import datetime, timezone
-from typing import Any
-from unittest.mock import MagicMock
+from typing import Any, ClassVar
 from uuid import uuid4
 
+import httpx
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
-from prompt_forge.db.client import SupabaseClient
+from prompt_forge.core.audit import AuditLogger, get_audit_logger
+from prompt_forge.core.composer import CompositionEngine, get_composer
+from prompt_forge.core.registry import PromptRegistry, get_registry
+from prompt_forge.core.resolver import PromptResolver, get_resolver
+from prompt_forge.core.vcs import VersionControl, get_vcs
+from prompt_forge.db.client import SupabaseClient, get_supabase_client
+from prompt_forge.db.persona_store import PersonaPromptStore, get_persona_store
+from prompt_forge.main import app as _app
 
+# Row timestamps share the session start time with a monotonically increasing
+# microsecond suffix: recent enough for date-window queries, strictly ordered
+# for order_by="created_at", and no clock read or datetime formatting per write.
+_TS_PREFIX = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+_ts_counter = itertools.count()
 
-class MockSupabaseClient(SupabaseClient):
-    """In-memory mock of the Supabase client for testing."""
-
-    def __init__(self):
-        self._tables: dict[str, list[dict[str, Any]]] = {
-            "prompts": [],
-            "prompt_versions": [],
-            "prompt_branches": [],
-            "prompt_usage_log": [],
-            "audit_log": [],
-            "prompt_subscriptions": [],
-            "persona_prompts": [],
-        }
-
-    @property
-    def client(self):
-        """Mock the client.table().update().eq() pattern used in persona store."""
-        mock_client = MagicMock()
 
-        def mock_table(table_name):
-            table_mock = MagicMock()
+def _stamp() -> str:
+    return f"{_TS_PREFIX}.{next(_ts_counter):06d}+00:00"
 
-            def mock_update(data):
-                update_mock = MagicMock()
 
-                def mock_eq(column, value):
-                    eq_mock = MagicMock()
-
-                    def mock_execute():
-                        # Handle bulk updates for persona_prompts
-                        if table_name == "persona_prompts" and column == "persona":
-                            for row in self._tables.get(table_name, []):
-                                if row.get(column) == value:
-                                    row.update(data)
-                        return MagicMock()
-
-                    eq_mock.execute = mock_execute
-                    return eq_mock
-
-                update_mock.eq = mock_eq
-                return update_mock
-
-            table_mock.update = mock_update
-            return table_mock
+class MockSupabaseClient(SupabaseClient):
+    """In-memory mock of the Supabase client for testing.
+
+    Each table is a dict of rows keyed by ``id`` (insertion-ordered), with
+    secondary indices on common lookup columns so filtered selects only touch
+    matching rows instead of scanning the whole table. Multi-column filters
+    intersect the per-column id sets before any row dict is materialised.
+    Rows handed out are live, so writes must go through ``update``/
+    ``update_where`` to keep the indices coherent.
+    """
+
+    INDEXED_COLUMNS = (
+        "slug",
+        "prompt_id",
+        "branch",
+        "name",
+        "persona",
+        "version_id",
+        "session_uuid",
+        "mission_id",
+        "agent_id",
+        "model_id",
+        "version",
+        "is_latest",
+    )
+    # Column each versioned table numbers its versions within
+    VERSION_SCOPES: ClassVar[dict[str, str]] = {
+        "persona_prompts": "persona",
+        "prompt_versions": "prompt_id",
+    }
 
-        mock_client.table = mock_table
-        return mock_client
+    def __init__(self):
+        self._tables: dict[str, dict[str, dict[str, Any]]] = {
+            "prompts": {},
+            "prompt_versions": {},
+            "prompt_branches": {},
+            "prompt_usage_log": {},
+            "audit_log": {},
+            "prompt_subscriptions": {},
+            "persona_prompts": {},
+        }
+        # table -> column -> value -> ids (dict used as an insertion-ordered set)
+        self._indices: dict[str, dict[str, dict[Any, dict[str, None]]]] = {}
+        # (table, scope value) -> highest-version row, filled lazily
+        self._heads: dict[tuple[str, Any], dict[str, Any]] = {}
+        # Tables that have had rows inserted since the last reset()
+        self._dirty: set[str] = set()
+
+    def _index_add(self, table: str, record: dict[str, Any]) -> None:
+        indices = self._indices.setdefault(table, {})
+        for column in self.INDEXED_COLUMNS:
+            if column in record:
+                buckets = indices.setdefault(column, {})
+                buckets.setdefault(record[column], {})[record["id"]] = None
+
+        scope = self.VERSION_SCOPES.get(table)
+        head = self._heads.get((table, record.get(scope)))
+        if head is not None and record.get("version", 0) > head.get("version", 0):
+            self._heads[(table, record[scope])] = record
+
+    def _index_remove(self, table: str, record: dict[str, Any]) -> None:
+        indices = self._indices.get(table, {})
+        for column in self.INDEXED_COLUMNS:
+            if column in record:
+                indices.get(column, {}).get(record[column], {}).pop(record["id"], None)
+
+        scope = self.VERSION_SCOPES.get(table)
+        key = (table, record.get(scope))
+        if self._heads.get(key) is record:
+            del self._heads[key]
+
+    def _head(self, table: str, scope_value: Any) -> dict[str, Any] | None:
+        """Highest-version row for one persona/prompt, cached until it changes."""
+        key = (table, scope_value)
+        head = self._heads.get(key)
+        if head is None:
+            scope = self.VERSION_SCOPES[table]
+            ids = self._indices.get(table, {}).get(scope, {}).get(scope_value)
+            if not ids:
+                return None
+            rows = self._tables[table]
+            head = self._heads[key] = max((rows[i] for i in ids), key=lambda r: r.get("version", 0))
+        return head
+
+    def _matching(self, table: str, filters: dict[str, Any]) -> list[dict[str, Any]]:
+        """Rows matching every filter, narrowed via the id/secondary indices.
+
+        Indexed filters are resolved by id-set intersection; only the remaining
+        columns are compared against row dicts.
+        """
+        rows = self._tables.get(table, {})
+        if "id" in filters:
+            row = rows.get(filters["id"])
+            candidates = [row] if row is not None else []
+        else:
+            indices = self._indices.get(table, {})
+            buckets = [
+                indices.get(column, {}).get(filters[column], {})
+                for column in self.INDEXED_COLUMNS
+                if column in filters
+            ]
+            if buckets:
+                smallest = min(buckets, key=len)
+                candidates = [rows[i] for i in smallest if all(i in b for b in buckets)]
+            else:
+                candidates = list(rows.values())
+
+        residual = tuple(
+            (k, v) for k, v in filters.items() if k != "id" and k not in self.INDEXED_COLUMNS
+        )
+        if not residual:
+            return candidates
+        if len(residual) == 1:
+            ((key, value),) = residual
+            return [r for r in candidates if r.get(key) == value]
+        return [r for r in candidates if all(r.get(k) == v for k, v in residual)]
 
     def insert(self, table: str, data: dict[str, Any]) -> dict[str, Any]:
-        record = {
-            "id": str(uuid4()),
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-            **data,
-        }
-        self._tables.setdefault(table, []).append(record)
+        ts = _stamp()
+        record = {"id": str(uuid4()), "created_at": ts, "updated_at": ts, **data}
+        self._tables.setdefault(table, {})[record["id"]] = record
+        self._index_add(table, record)
+        self._dirty.add(table)
         return record
 
+    def insert_many(self, table: str, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        ts = _stamp()
+        records = [
+            {"id": str(uuid4()), "created_at": ts, "updated_at": ts, **item} for item in data
+        ]
+        rows = self._tables.setdefault(table, {})
+        for record in records:
+            rows[record["id"]] = record
+            self._index_add(table, record)
+        self._dirty.add(table)
+        return records
+
     def select(
         self,
         table: str,
@@ -78,94 +179,263 @@ class MockSupabaseClient(SupabaseClient):
         order_by: str | None = None,
         ascending: bool = True,
         limit: int | None = None,
+        offset: int = 0,
+        columns: str = "*",
     ) -> list[dict[str, Any]]:
-        rows = self._tables.get(table, [])
+        if not self._tables.get(table):
+            return []
+        scope = self.VERSION_SCOPES.get(table)
+        if (
+            order_by == "version"
+            and not ascending
+            and limit == 1
+            and not offset
+            and filters
+            and scope in filters
+        ):
+            # Latest-version lookup: if the cached head satisfies the filters it
+            # is the answer, otherwise fall through to the general path.
+            head = self._head(table, filters[scope])
+            if head is None:
+                return []
+            if all(head.get(k) == v for k, v in filters.items()):
+                return self._project([head], columns)
         if filters:
-            for key, value in filters.items():
-                rows = [r for r in rows if r.get(key) == value]
+            rows = self._matching(table, filters)
+        else:
+            rows = list(self._tables.get(table, {}).values())
         if order_by:
-            rows = sorted(rows, key=lambda r: r.get(order_by, 0), reverse=not ascending)
+
+            def key(r):
+                return r.get(order_by, 0)
+
+            if limit:
+                # Top-k selection: O(N log k) instead of sorting every row
+                pick = heapq.nsmallest if ascending else heapq.nlargest
+                rows = pick(offset + limit, rows, key=key)
+            else:
+                rows = sorted(rows, key=key, reverse=not ascending)
+        if offset:
+            rows = rows[offset:]
         if limit:
             rows = rows[:limit]
-        return rows
+        return self._project(rows, columns)
+
+    @staticmethod
+    def _project(rows: list[dict[str, Any]], columns: str) -> list[dict[str, Any]]:
+        if columns == "*":
+            return rows
+        keys = columns.split(",")
+        return [{k: r.get(k) for k in keys} for r in rows]
 
     def update(self, table: str, id: str, data: dict[str, Any]) -> dict[str, Any]:
-        for row in self._tables.get(table, []):
-            if row["id"] == id:
-                row.update(data)
-                row["updated_at"] = datetime.now(timezone.utc).isoformat()
-                return row
-        raise ValueError(f"Row {id} not found in {table}")
+        row = self._tables.get(table, {}).get(id)
+        if row is None:
+            raise ValueError(f"Row {id} not found in {table}")
+        self._index_remove(table, row)
+        row.update(data)
+        row["updated_at"] = _stamp()
+        self._index_add(table, row)
+        return row
+
+    def update_where(
+        self, table: str, filters: dict[str, Any], data: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """Bulk update every row matching ``filters`` (narrowed via the indices)."""
+        rows = self._matching(table, filters)
+        for row in rows:
+            self._index_remove(table, row)
+            row.update(data)
+            row["updated_at"] = _stamp()
+            self._index_add(table, row)
+        return rows
 
     def delete(self, table: str, id: str) -> None:
-        self._tables[table] = [r for r in self._tables.get(table, []) if r["id"] != id]
+        row = self._tables.get(table, {}).pop(id, None)
+        if row is not None:
+            self._index_remove(table, row)
+
+    def delete_before(
+        self, table: str, column: str, cutoff: str, *, include_null: bool = False
+    ) -> int:
+        stale = [
+            r
+            for r in self._tables.get(table, {}).values()
+            if (r[column] < cutoff if r.get(column) is not None else include_null)
+        ]
+        for row in stale:
+            self.delete(table, row["id"])
+        return len(stale)
+
+    def rpc(self, function: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        handler = getattr(self, f"_rpc_{function}", None)
+        if handler is None:
+            raise ValueError(f"Unknown RPC function: {function}")
+        return handler(**params)
+
+    def _rpc_create_persona_version(self, p_persona: str, p_template: str) -> list[dict[str, Any]]:
+        """Mirror of the create_persona_version Postgres function (migration 008)."""
+        rows = self.select("persona_prompts", filters={"persona": p_persona})
+        next_version = max((r["version"] for r in rows), default=0) + 1
+        self.update_where(
+            "persona_prompts", {"persona": p_persona, "is_latest": True}, {"is_latest": False}
+        )
+        record = self.insert(
+            "persona_prompts",
+            {
+                "persona": p_persona,
+                "version": next_version,
+                "template": p_template,
+                "is_latest": True,
+            },
+        )
+        return [record]
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """Capture table contents for a later ``restore``.
+
+        Row dicts are copied one level deep; nested values (e.g. ``content``)
+        are shared, which is safe because writes replace them rather than
+        mutating them in place.
+        """
+        return {
+            table: [dict(row) for row in rows.values()]
+            for table, rows in self._tables.items()
+            if rows
+        }
+
+    def restore(self, state: dict[str, list[dict[str, Any]]]) -> None:
+        """Replace all table contents with a ``snapshot``, rebuilding the indices."""
+        self.reset()
+        for table, rows in state.items():
+            bucket = self._tables.setdefault(table, {})
+            for row in rows:
+                record = dict(row)
+                bucket[record["id"]] = record
+                self._index_add(table, record)
+            self._dirty.add(table)
 
     def reset(self):
-        for table in self._tables:
-            self._tables[table] = []
+        # Only inserts can populate a table, so untouched tables are already empty
+        for table in self._dirty:
+            self._tables[table] = {}
+            self._indices.pop(table, None)
+        self._heads.clear()
+        self._dirty.clear()
 
 
-@pytest.fixture
-def mock_db() -> MockSupabaseClient:
-    """Fresh mock database for each test."""
-    return MockSupabaseClient()
+# One database and one wired-up app for the whole session; tests get a clean
+# slate through ``reset()`` rather than rebuilding the service graph each time.
+_shared_db = MockSupabaseClient()
 
 
-@pytest.fixture
-def sample_content() -> dict[str, Any]:
-    """Sample prompt content."""
-    return {
-        "sections": [
-            {"id": "identity", "label": "Identity", "content": "You are a senior code reviewer."},
-            {"id": "skills", "label": "Skills", "content": "You excel at Python and security."},
-            {"id": "constraints", "label": "Constraints", "content": "Be concise."},
-        ],
-        "variables": {"project_name": "{{project_name}}"},
-        "metadata": {"estimated_tokens": 50},
-    }
+@pytest.fixture(scope="session")
+def shared_db() -> MockSupabaseClient:
+    """The session's mock database, for wiring longer-lived fixtures.
+
+    Tests that read or write it should still request ``mock_db`` so it is reset.
+    """
+    return _shared_db
 
 
 @pytest.fixture
-def app(mock_db):
-    """FastAPI test app with mocked dependencies."""
-    from prompt_forge.core.audit import AuditLogger
-    from prompt_forge.core.composer import CompositionEngine
-    from prompt_forge.core.registry import PromptRegistry
-    from prompt_forge.core.resolver import PromptResolver
-    from prompt_forge.core.vcs import VersionControl
-    from prompt_forge.main import app as _app
+def mock_db(shared_db) -> Iterator[MockSupabaseClient]:
+    """Shared mock database, emptied after each test."""
+    yield shared_db
+    shared_db.reset()
+
+
+# Shared across tests; callers copy before modifying (see test_api_versions)
+_SAMPLE_CONTENT: dict[str, Any] = {
+    "sections": [
+        {"id": "identity", "label": "Identity", "content": "You are a senior code reviewer."},
+        {"id": "skills", "label": "Skills", "content": "You excel at Python and security."},
+        {"id": "constraints", "label": "Constraints", "content": "Be concise."},
+    ],
+    "variables": {"project_name": "{{project_name}}"},
+    "metadata": {"estimated_tokens": 50},
+}
+
+
+@pytest.fixture(scope="session")
+def sample_content() -> Iterator[dict[str, Any]]:
+    """Sample prompt content, shared by every test and checked for mutation."""
+    # A MappingProxyType would not survive json= encoding or storage in the mock,
+    # so guard the plain dict against in-place edits instead.
+    pristine = copy.deepcopy(_SAMPLE_CONTENT)
+    yield _SAMPLE_CONTENT
+    assert _SAMPLE_CONTENT == pristine, "a test mutated sample_content; copy it first"
+
 
+@pytest.fixture
+def seed_prompt(mock_db) -> Callable[..., dict[str, Any]]:
+    """Create a prompt (and optional v1) straight in the mock, skipping the HTTP layer."""
     registry = PromptRegistry(mock_db)
-    vcs = VersionControl(mock_db)
-    resolver = PromptResolver(mock_db)
-    composer = CompositionEngine(resolver, registry)
-    audit = AuditLogger(mock_db)
 
-    # Override dependencies
-    from prompt_forge.core.audit import get_audit_logger
-    from prompt_forge.core.registry import get_registry
-    from prompt_forge.core.vcs import get_vcs
-    from prompt_forge.core.resolver import get_resolver
-    from prompt_forge.core.composer import get_composer
-    from prompt_forge.db.client import get_supabase_client
-    from prompt_forge.db.persona_store import get_persona_store, PersonaPromptStore
-
-    persona_store = PersonaPromptStore(mock_db)
-
-    _app.dependency_overrides[get_registry] = lambda: registry
-    _app.dependency_overrides[get_vcs] = lambda: vcs
-    _app.dependency_overrides[get_resolver] = lambda: resolver
-    _app.dependency_overrides[get_composer] = lambda: composer
-    _app.dependency_overrides[get_supabase_client] = lambda: mock_db
-    _app.dependency_overrides[get_audit_logger] = lambda: audit
-    _app.dependency_overrides[get_persona_store] = lambda: persona_store
+    def _seed(
+        slug: str, name: str, type: str, content: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        return registry.create_prompt(
+            slug=slug, name=name, type=type, content=content, initial_message="init"
+        )
+
+    return _seed
+
+
+def _provide(service: Any) -> Callable[[], Any]:
+    # Zero-arg closure: FastAPI would read a default argument as a query param
+    return lambda: service
+
+
+@pytest.fixture(scope="session")
+def app():
+    """FastAPI test app with mocked dependencies, wired once per session."""
+    registry = PromptRegistry(_shared_db)
+    resolver = PromptResolver(_shared_db)
+    services = {
+        get_registry: registry,
+        get_vcs: VersionControl(_shared_db),
+        get_resolver: resolver,
+        get_composer: CompositionEngine(resolver, registry),
+        get_supabase_client: _shared_db,
+        get_audit_logger: AuditLogger(_shared_db),
+        get_persona_store: PersonaPromptStore(_shared_db),
+    }
 
+    # Override dependencies
+    _app.dependency_overrides.update(
+        {dependency: _provide(service) for dependency, service in services.items()}
+    )
     yield _app
 
     _app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="session")
+def _http_client(app) -> Iterator[TestClient]:
+    # Not entered as a context manager: tests don't need the lifespan (NATS etc.)
+    test_client = TestClient(app)
+    # Warm-up: pay the first-request route/validation setup here, not in whichever test runs first
+    test_client.get("/api/v1/prompts")
+    yield test_client
+    test_client.close()
+
+
 @pytest.fixture
-def client(app) -> TestClient:
-    """HTTP test client."""
-    return TestClient(app)
+def client(_http_client, mock_db) -> TestClient:
+    """HTTP test client; depends on ``mock_db`` so each test starts empty."""
+    _http_client.cookies.clear()
+    return _http_client
+
+
+@pytest.fixture
+async def asgi_client(app, mock_db) -> AsyncIterator[httpx.AsyncClient]:
+    """Async client calling the app in-process over ASGI, without TestClient's thread portal."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
+        yield ac
+
+
+def load_json(resp: Any) -> Any:
+    """Parse a response body with orjson rather than the stdlib ``resp.json()``."""
+    return orjson.loads(resp.content)
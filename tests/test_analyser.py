@@ -8,21 +8,23 @@ from prompt_forge.core.analyser import analyse_verbose_prompts
 class TestAnalyseVerbosePrompts:
     def _seed(self, mock_db, version_tokens: dict[str, int]):
         """Seed prompt_effectiveness with per-version average tokens."""
-        for vid, avg_tokens in version_tokens.items():
-            for i in range(5):
-                mock_db.insert(
-                    "prompt_effectiveness",
-                    {
-                        "session_uuid": f"sess-{vid}-{i}",
-                        "version_id": vid,
-                        "prompt_id": "prompt-1",
-                        "agent_id": "developer",
-                        "model_id": "claude-sonnet-4-5-20250929",
-                        "total_tokens": avg_tokens,
-                        "outcome_score": 0.8,
-                        "created_at": "2026-02-15T00:00:00Z",
-                    },
-                )
+        mock_db.insert_many(
+            "prompt_effectiveness",
+            [
+                {
+                    "session_uuid": f"sess-{vid}-{i}",
+                    "version_id": vid,
+                    "prompt_id": "prompt-1",
+                    "agent_id": "developer",
+                    "model_id": "claude-sonnet-4-5-20250929",
+                    "total_tokens": avg_tokens,
+                    "outcome_score": 0.8,
+                    "created_at": "2026-02-15T00:00:00Z",
+                }
+                for vid, avg_tokens in version_tokens.items()
+                for i in range(5)
+            ],
+        )
 
     @pytest.mark.asyncio
     async def test_flags_verbose_version(self, mock_db, monkeypatch):
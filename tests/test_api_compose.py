@@ -1,31 +1,15 @@
 """Tests for composition API endpoints."""
 
+_PYTHON_SKILL_CONTENT = {"sections": [{"id": "main", "content": "Expert in Python."}]}
+
 
 class TestComposeAPI:
-    def _seed(self, client, sample_content):
-        client.post(
-            "/api/v1/prompts", json={"slug": "reviewer", "name": "Reviewer", "type": "persona"}
-        )
-        client.post(
-            "/api/v1/prompts/reviewer/versions",
-            json={
-                "content": sample_content,
-                "message": "init",
-            },
-        )
-        client.post(
-            "/api/v1/prompts", json={"slug": "python-skill", "name": "Python", "type": "skill"}
-        )
-        client.post(
-            "/api/v1/prompts/python-skill/versions",
-            json={
-                "content": {"sections": [{"id": "main", "content": "Expert in Python."}]},
-                "message": "init",
-            },
-        )
+    def _seed(self, seed_prompt, sample_content):
+        seed_prompt("reviewer", "Reviewer", "persona", content=sample_content)
+        seed_prompt("python-skill", "Python", "skill", content=_PYTHON_SKILL_CONTENT)
 
-    def test_compose(self, client, sample_content):
-        self._seed(client, sample_content)
+    def test_compose(self, client, seed_prompt, sample_content):
+        self._seed(seed_prompt, sample_content)
         resp = client.post(
             "/api/v1/compose",
             json={
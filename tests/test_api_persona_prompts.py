@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import pytest
 from fastapi.testclient import TestClient
 
 
@@ -69,19 +70,28 @@ def test_get_persona_prompt_specific_version(client: TestClient):
     assert data["template"] == template
 
 
-def test_create_multiple_versions(client: TestClient, app):
-    """Test creating multiple versions of a persona prompt."""
-    # We need to mock the bulk update operation for this test
-    from prompt_forge.db.client import get_supabase_client
+def test_get_persona_prompt_not_modified(client: TestClient):
+    """Test conditional GET returns 304 until a new version is created."""
+    client.post("/api/v1/persona-prompts/tester", json={"template": "v1"})
+
+    response = client.get("/api/v1/persona-prompts/tester")
+    etag = response.headers["ETag"]
+    assert client.get("/api/v1/persona-prompts/tester/1").headers["ETag"] == etag
 
-    def mock_update_previous_versions(client, mock_db):
-        """Helper to mock the bulk update operation."""
-        for row in mock_db._tables["persona_prompts"]:
-            if row["persona"] == "architect" and not row.get("version") == 2:
-                row["is_latest"] = False
+    cached = client.get("/api/v1/persona-prompts/tester", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
 
-    mock_db = app.dependency_overrides[get_supabase_client]()
+    client.post("/api/v1/persona-prompts/tester", json={"template": "v2"})
+    refreshed = client.get("/api/v1/persona-prompts/tester", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["version"] == 2
+    stale = client.get("/api/v1/persona-prompts/tester/1", headers={"If-None-Match": etag})
+    assert stale.status_code == 200
+    assert stale.json()["is_latest"] is False
 
+
+def test_create_multiple_versions(client: TestClient):
+    """Test creating multiple versions of a persona prompt."""
     template1 = "You are an architect v1. Context: {{context}}"
     template2 = "You are an architect v2. Context: {{context}}"
 
@@ -91,9 +101,6 @@ def test_create_multiple_versions(client: TestClient, app):
     data1 = response1.json()
     assert data1["version"] == 1
 
-    # Mock the bulk update
-    mock_update_previous_versions(client, mock_db)
-
     # Create second version
     response2 = client.post("/api/v1/persona-prompts/architect", json={"template": template2})
     assert response2.status_code == 201
@@ -108,20 +115,11 @@ def test_create_multiple_versions(client: TestClient, app):
     assert latest_data["template"] == template2
 
 
-def test_list_persona_prompt_versions(client: TestClient, app):
+def test_list_persona_prompt_versions(client: TestClient):
     """Test listing all versions of a persona prompt."""
-    from prompt_forge.db.client import get_supabase_client
-
-    mock_db = app.dependency_overrides[get_supabase_client]()
-
     templates = ["Version 1", "Version 2", "Version 3"]
 
-    for i, template in enumerate(templates, 1):
-        # Mock the bulk update for previous versions
-        for row in mock_db._tables["persona_prompts"]:
-            if row["persona"] == "researcher" and row["version"] < i:
-                row["is_latest"] = False
-
+    for template in templates:
         client.post("/api/v1/persona-prompts/researcher", json={"template": template})
 
     response = client.get("/api/v1/persona-prompts/researcher/versions")
@@ -142,28 +140,46 @@ def test_list_persona_prompt_versions_not_found(client: TestClient):
     assert response.json()["detail"] == "Persona 'nonexistent' not found"
 
 
-def test_seed_initial_personas(client: TestClient):
-    """Test seeding initial personas."""
-    response = client.post("/api/v1/persona-prompts/seed")
+_SEEDED_PERSONAS = ("researcher", "developer", "reviewer", "tester", "architect")
+
+
+@pytest.fixture(scope="module")
+def seeded_personas(_http_client, shared_db) -> dict[str, dict]:
+    """Seed once through the API and capture each persona's latest version."""
+    response = _http_client.post("/api/v1/persona-prompts/seed")
     assert response.status_code == 201
     assert response.json()["message"] == "Initial personas seeded successfully"
+    rows = shared_db.select("persona_prompts", filters={"is_latest": True})
+    latest = {}
+    for persona in _SEEDED_PERSONAS:
+        get_response = _http_client.get(f"/api/v1/persona-prompts/{persona}")
+        assert get_response.status_code == 200
+        latest[persona] = get_response.json()
+    # Leave the shared database empty for the tests that follow, as mock_db would
+    shared_db.reset()
+    return {"rows": rows, "latest": latest}
 
-    # Verify that personas were created
-    expected_personas = ["researcher", "developer", "reviewer", "tester", "architect"]
 
-    for persona in expected_personas:
-        get_response = client.get(f"/api/v1/persona-prompts/{persona}")
-        assert get_response.status_code == 200
-        data = get_response.json()
-        assert data["version"] == 1
-        assert data["is_latest"] is True
-        # Check that template contains expected placeholders
-        template = data["template"]
-        assert "{{objective}}" in template
-        assert "{{context}}" in template
-        assert "{{constraints}}" in template
-        assert "{{scope_paths}}" in template
-        assert "{{alexandria_context}}" in template
+def test_seed_initial_personas(seeded_personas):
+    """Test seeding initial personas."""
+    rows = seeded_personas["rows"]
+    assert sorted(r["persona"] for r in rows) == sorted(_SEEDED_PERSONAS)
+    assert all(r["version"] == 1 for r in rows)
+
+
+@pytest.mark.parametrize("persona", _SEEDED_PERSONAS)
+def test_seeded_persona_template(seeded_personas, persona: str):
+    """Test that each seeded persona is served with the expected placeholders."""
+    data = seeded_personas["latest"][persona]
+    assert data["version"] == 1
+    assert data["is_latest"] is True
+    # Check that template contains expected placeholders
+    template = data["template"]
+    assert "{{objective}}" in template
+    assert "{{context}}" in template
+    assert "{{constraints}}" in template
+    assert "{{scope_paths}}" in template
+    assert "{{alexandria_context}}" in template
 
 
 def test_create_persona_prompt_empty_template(client: TestClient):
@@ -1,5 +1,10 @@
 """Tests for prompt API endpoints."""
 
+from prompt_forge import __version__
+
+_PERSONA_AA = {"slug": "aa", "name": "A", "type": "persona"}
+_SKILL_BB = {"slug": "bb", "name": "B", "type": "skill"}
+
 
 class TestPromptAPI:
     def test_create_prompt(self, client):
@@ -21,15 +26,15 @@ class TestPromptAPI:
         assert resp.status_code == 409
 
     def test_list_prompts(self, client):
-        client.post("/api/v1/prompts", json={"slug": "aa", "name": "A", "type": "persona"})
-        client.post("/api/v1/prompts", json={"slug": "bb", "name": "B", "type": "skill"})
+        client.post("/api/v1/prompts", json=_PERSONA_AA)
+        client.post("/api/v1/prompts", json=_SKILL_BB)
         resp = client.get("/api/v1/prompts")
         assert resp.status_code == 200
         assert len(resp.json()) == 2
 
     def test_list_filter_type(self, client):
-        client.post("/api/v1/prompts", json={"slug": "aa", "name": "A", "type": "persona"})
-        client.post("/api/v1/prompts", json={"slug": "bb", "name": "B", "type": "skill"})
+        client.post("/api/v1/prompts", json=_PERSONA_AA)
+        client.post("/api/v1/prompts", json=_SKILL_BB)
         resp = client.get("/api/v1/prompts?type=skill")
         assert len(resp.json()) == 1
 
@@ -58,3 +63,13 @@ class TestPromptAPI:
         resp = client.get("/health")
         assert resp.status_code == 200
         assert resp.json()["status"] == "healthy"
+        assert resp.headers["Cache-Control"] == "no-cache"
+
+    def test_root_reports_package_version(self, client):
+        assert client.get("/").json()["version"] == __version__
+
+    def test_health_not_modified(self, client):
+        etag = client.get("/health").headers["ETag"]
+        resp = client.get("/health", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
@@ -2,21 +2,75 @@
 
 import json
 
+import pytest
 
-class TestVersionAPI:
-    def _create_prompt(self, client):
-        resp = client.post(
-            "/api/v1/prompts",
-            json={
-                "slug": "versioned",
-                "name": "V",
-                "type": "persona",
-            },
-        )
-        return resp.json()
+from prompt_forge.core.registry import PromptRegistry
+from prompt_forge.core.vcs import VersionControl
+from tests.conftest import MockSupabaseClient
+
+
+@pytest.fixture(scope="module")
+def versioned_baseline():
+    """Database state with the 'versioned' prompt, built once for the module."""
+    db = MockSupabaseClient()
+    PromptRegistry(db).create_prompt(slug="versioned", name="V", type="persona")
+    return db.snapshot()
+
+
+@pytest.fixture(scope="module")
+def v1_baseline(sample_content):
+    """As ``versioned_baseline``, plus a committed v1 of ``sample_content``."""
+    db = MockSupabaseClient()
+    prompt = PromptRegistry(db).create_prompt(slug="versioned", name="V", type="persona")
+    VersionControl(db).commit(prompt["id"], sample_content, "v1")
+    return db.snapshot()
 
+
+@pytest.fixture
+def versioned_prompt(mock_db, versioned_baseline):
+    mock_db.restore(versioned_baseline)
+
+
+@pytest.fixture
+def v1_prompt(mock_db, v1_baseline):
+    mock_db.restore(v1_baseline)
+
+
+@pytest.mark.usefixtures("v1_prompt")
+class TestRegressionGuard:
+    @pytest.mark.parametrize(
+        ("wipe", "acknowledge", "status", "warning_type", "error"),
+        [
+            # Modify content slightly — remove one key
+            pytest.param(False, True, 201, "keys_removed", None, id="warns"),
+            # Replace everything with an empty sections list
+            pytest.param(True, False, 409, None, "content_regression_blocked", id="blocks"),
+            pytest.param(True, True, 201, "keys_removed", None, id="bypass"),
+        ],
+    )
+    def test_regression_guard(
+        self, client, sample_content, wipe, acknowledge, status, warning_type, error
+    ):
+        if wipe:
+            content = {"sections": []}
+        else:
+            content = {k: v for k, v in sample_content.items() if k != "variables"}
+        body = {"content": content, "message": "v2"}
+        if acknowledge:
+            body["acknowledge_reduction"] = True
+        resp = client.post("/api/v1/prompts/versioned/versions", json=body)
+        assert resp.status_code == status
+        data = resp.json()
+        if error is not None:
+            assert data["detail"]["error"] == error
+        else:
+            assert data["warnings"] is not None
+            assert any(w["type"] == warning_type for w in data["warnings"])
+
+
+@pytest.mark.usefixtures("versioned_prompt")
+class TestVersionAPI:
     def test_create_version(self, client, sample_content):
-        self._create_prompt(client)
         resp = client.post(
             "/api/v1/prompts/versioned/versions",
             json={
@@ -29,7 +83,6 @@ class TestVersionAPI:
         assert resp.json()["version"] == 1
 
     def test_list_versions(self, client, sample_content):
-        self._create_prompt(client)
         client.post(
             "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
         )
@@ -40,58 +93,7 @@ class TestVersionAPI:
         assert resp.status_code == 200
         assert len(resp.json()) == 2
 
-    def test_regression_guard_warns(self, client, sample_content):
-        self._create_prompt(client)
-        client.post(
-            "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
-        )
-        # Modify content slightly — remove one key
-        modified = {**sample_content}
-        del modified["variables"]
-        resp = client.post(
-            "/api/v1/prompts/versioned/versions",
-            json={
-                "content": modified,
-                "message": "v2",
-                "acknowledge_reduction": True,
-            },
-        )
-        assert resp.status_code == 201
-        assert resp.json()["warnings"] is not None
-        assert any(w["type"] == "keys_removed" for w in resp.json()["warnings"])
-
-    def test_regression_guard_blocks(self, client, sample_content):
-        self._create_prompt(client)
-        client.post(
-            "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
-        )
-        resp = client.post(
-            "/api/v1/prompts/versioned/versions",
-            json={
-                "content": {"sections": []},
-                "message": "v2",
-            },
-        )
-        assert resp.status_code == 409
-        assert resp.json()["detail"]["error"] == "content_regression_blocked"
-
-    def test_regression_guard_bypass(self, client, sample_content):
-        self._create_prompt(client)
-        client.post(
-            "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
-        )
-        resp = client.post(
-            "/api/v1/prompts/versioned/versions",
-            json={
-                "content": {"sections": []},
-                "message": "v2",
-                "acknowledge_reduction": True,
-            },
-        )
-        assert resp.status_code == 201
-
     def test_patch_version(self, client, sample_content):
-        self._create_prompt(client)
         client.post(
             "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
         )
@@ -111,7 +113,6 @@ class TestVersionAPI:
         assert resp.json()["content"]["slack_identity"] == "U0AE9ME4SNB"
 
     def test_patch_null_removes_field(self, client, sample_content):
-        self._create_prompt(client)
         client.post(
             "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
         )
@@ -127,7 +128,6 @@ class TestVersionAPI:
         assert "sections" in resp.json()["content"]
 
     def test_field_diff(self, client):
-        self._create_prompt(client)
         v1_content = {"identity": "I am Kai", "voice": "Warm", "principles": ["Be kind"]}
         v2_content = {"identity": "I am Kai v2", "slack_id": "U123"}
         client.post(
@@ -153,7 +153,6 @@ class TestVersionAPI:
         assert actions["identity"] == "modified"
 
     def test_restore_version(self, client, sample_content):
-        self._create_prompt(client)
         client.post(
             "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
         )
@@ -177,7 +176,6 @@ class TestVersionAPI:
         assert resp.json()["content"] == sample_content
 
     def test_restore_with_patch(self, client, sample_content):
-        self._create_prompt(client)
         client.post(
             "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
         )
@@ -202,7 +200,6 @@ class TestVersionAPI:
         assert resp.json()["content"]["sections"] == sample_content["sections"]
 
     def test_rollback(self, client, sample_content):
-        self._create_prompt(client)
         client.post(
             "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
         )
@@ -219,43 +216,32 @@ class TestVersionAPI:
         assert resp.json()["version"] == 3
         assert resp.json()["content"] == sample_content
 
-    def test_get_latest_version(self, client, sample_content):
-        """Bug 2: GET /versions/latest returns the most recent version."""
-        self._create_prompt(client)
-        client.post(
-            "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
-        )
-        client.post(
-            "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v2"}
-        )
-        resp = client.get("/api/v1/prompts/versioned/versions/latest")
-        assert resp.status_code == 200
-        assert resp.json()["version"] == 2
+    def test_latest_route_behavior(self, client, sample_content):
+        """Bug 2: /versions/latest tracks the newest version and never shadows /versions/{int}."""
+        latest_url = "/api/v1/prompts/versioned/versions/latest"
 
-    def test_get_latest_version_no_versions_404(self, client):
-        """Bug 2: /versions/latest returns 404 if no versions exist."""
-        self._create_prompt(client)
-        resp = client.get("/api/v1/prompts/versioned/versions/latest")
-        assert resp.status_code == 404
+        resp = client.get(latest_url)
+        assert resp.status_code == 404, "no versions yet"
 
-    def test_get_latest_does_not_conflict_with_version_int(self, client, sample_content):
-        """Bug 2: /versions/latest must not be matched by /versions/{version:int}."""
-        self._create_prompt(client)
         client.post(
             "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v1"}
         )
-        # /versions/1 should still work
         resp_int = client.get("/api/v1/prompts/versioned/versions/1")
-        assert resp_int.status_code == 200
+        assert resp_int.status_code == 200, "/versions/1 must still route to the int handler"
         assert resp_int.json()["version"] == 1
-        # /versions/latest should work too
-        resp_latest = client.get("/api/v1/prompts/versioned/versions/latest")
+        resp_latest = client.get(latest_url)
         assert resp_latest.status_code == 200
         assert resp_latest.json()["version"] == 1
 
+        client.post(
+            "/api/v1/prompts/versioned/versions", json={"content": sample_content, "message": "v2"}
+        )
+        resp = client.get(latest_url)
+        assert resp.status_code == 200
+        assert resp.json()["version"] == 2, "latest must follow the newest commit"
+
     def test_content_with_control_chars_produces_valid_json(self, client):
         """Bug 1: Content with newlines/tabs must produce valid JSON."""
-        self._create_prompt(client)
         content = {
             "voice": "Warm and empathetic.\nUses metaphors.\tAsks probing questions.",
             "identity": "You are Kai.\r\nA helpful assistant.",
@@ -266,20 +252,17 @@ class TestVersionAPI:
         resp = client.get("/api/v1/prompts/versioned/versions/latest")
         assert resp.status_code == 200
         # The raw response body must be valid JSON (jq-compatible)
-        raw_body = resp.content.decode("utf-8")
-        parsed = json.loads(raw_body)  # Would raise if invalid control chars
+        parsed = json.loads(resp.content)  # Would raise if invalid control chars
         assert parsed["content"]["voice"] == content["voice"]
         assert parsed["content"]["identity"] == content["identity"]
 
     def test_list_versions_valid_json_with_control_chars(self, client):
         """Bug 1: List endpoint also produces valid JSON with control chars."""
-        self._create_prompt(client)
         content = {"voice": "Line 1\nLine 2\nLine 3"}
         client.post(
             "/api/v1/prompts/versioned/versions", json={"content": content, "message": "v1"}
         )
         resp = client.get("/api/v1/prompts/versioned/versions")
         assert resp.status_code == 200
-        raw_body = resp.content.decode("utf-8")
-        parsed = json.loads(raw_body)
+        parsed = json.loads(resp.content)
         assert parsed[0]["content"]["voice"] == "Line 1\nLine 2\nLine 3"
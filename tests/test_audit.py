@@ -18,6 +18,64 @@ def audit(db):
     return AuditLogger(db)
 
 
+# (audit.log rows, audit.query kwargs, expected entry count)
+_QUERY_CASES = [
+    pytest.param(
+        [
+            ("prompt.created", "prompt", "id1", "user1"),
+            ("prompt.updated", "prompt", "id1", "user1"),
+            ("version.committed", "version", "id2", "user2"),
+        ],
+        {},
+        3,
+        id="all",
+    ),
+    pytest.param(
+        [
+            ("prompt.created", "prompt", "id1", "user1"),
+            ("version.committed", "version", "id2", "user2"),
+        ],
+        {"action": "prompt.created"},
+        1,
+        id="action",
+    ),
+    pytest.param(
+        [
+            ("prompt.created", "prompt", "id1", "alice"),
+            ("prompt.created", "prompt", "id2", "bob"),
+        ],
+        {"actor": "alice"},
+        1,
+        id="actor",
+    ),
+    pytest.param(
+        [
+            ("prompt.created", "prompt", "id1", "user1"),
+            ("version.committed", "version", "id2", "user1"),
+        ],
+        {"entity_type": "prompt"},
+        1,
+        id="entity_type",
+    ),
+    pytest.param(
+        [
+            ("prompt.created", "prompt", "id1", "user1"),
+            ("prompt.updated", "prompt", "id1", "user1"),
+            ("prompt.created", "prompt", "id2", "user1"),
+        ],
+        {"entity_id": "id1"},
+        2,
+        id="entity_id",
+    ),
+    pytest.param(
+        [(f"action.{i}", "prompt", f"id{i}", "user1") for i in range(10)],
+        {"limit": 3},
+        3,
+        id="limit",
+    ),
+]
+
+
 class TestAuditLogging:
     def test_log_creates_entry(self, audit):
         entry = audit.log(
@@ -31,51 +89,16 @@ class TestAuditLogging:
         assert entry["actor"] == "test-user"
         assert entry["details"]["slug"] == "test-prompt"
 
-    def test_query_returns_entries(self, audit):
-        audit.log("prompt.created", "prompt", "id1", "user1")
-        audit.log("prompt.updated", "prompt", "id1", "user1")
-        audit.log("version.committed", "version", "id2", "user2")
-
-        entries = audit.query()
-        assert len(entries) == 3
-
-    def test_query_filter_by_action(self, audit):
-        audit.log("prompt.created", "prompt", "id1", "user1")
-        audit.log("version.committed", "version", "id2", "user2")
-
-        entries = audit.query(action="prompt.created")
-        assert len(entries) == 1
-        assert entries[0].action == "prompt.created"
-
-    def test_query_filter_by_actor(self, audit):
-        audit.log("prompt.created", "prompt", "id1", "alice")
-        audit.log("prompt.created", "prompt", "id2", "bob")
-
-        entries = audit.query(actor="alice")
-        assert len(entries) == 1
-        assert entries[0].actor == "alice"
-
-    def test_query_filter_by_entity(self, audit):
-        audit.log("prompt.created", "prompt", "id1", "user1")
-        audit.log("version.committed", "version", "id2", "user1")
-
-        entries = audit.query(entity_type="prompt")
-        assert len(entries) == 1
-
-    def test_query_filter_by_entity_id(self, audit):
-        audit.log("prompt.created", "prompt", "id1", "user1")
-        audit.log("prompt.updated", "prompt", "id1", "user1")
-        audit.log("prompt.created", "prompt", "id2", "user1")
-
-        entries = audit.query(entity_id="id1")
-        assert len(entries) == 2
-
-    def test_query_limit(self, audit):
-        for i in range(10):
-            audit.log(f"action.{i}", "prompt", f"id{i}", "user1")
+    @pytest.mark.parametrize(("rows", "query_kwargs", "expected"), _QUERY_CASES)
+    def test_query_filter(self, audit, rows, query_kwargs, expected):
+        for row in rows:
+            audit.log(*row)
 
-        entries = audit.query(limit=3)
-        assert len(entries) == 3
+        entries = audit.query(**query_kwargs)
+        assert len(entries) == expected
+        for key, value in query_kwargs.items():
+            if key != "limit":
+                assert all(getattr(e, key) == value for e in entries)
 
     def test_entry_contains_details(self, audit):
         audit.log(
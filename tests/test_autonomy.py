@@ -4,23 +4,30 @@ import pytest
 
 from prompt_forge.core.autonomy import analyse_autonomy_candidates
 
+# Fields shared by every seeded session
+_SESSION_TEMPLATE = {
+    "model_id": "claude-sonnet-4-5-20250929",
+    "outcome_score": 0.85,
+    "completed_at": "2026-02-15T12:00:00Z",
+    "created_at": "2026-02-15T00:00:00Z",
+}
+
 
 class TestAnalyseAutonomyCandidates:
     def _seed(self, mock_db, agent_id: str, count: int, interventions: int):
         """Seed prompt_effectiveness with sessions for an agent."""
-        for i in range(count):
-            mock_db.insert(
-                "prompt_effectiveness",
+        mock_db.insert_many(
+            "prompt_effectiveness",
+            [
                 {
+                    **_SESSION_TEMPLATE,
                     "session_uuid": f"sess-{agent_id}-{i}",
                     "agent_id": agent_id,
-                    "model_id": "claude-sonnet-4-5-20250929",
                     "human_interventions": 1 if i < interventions else 0,
-                    "outcome_score": 0.85,
-                    "completed_at": "2026-02-15T12:00:00Z",
-                    "created_at": "2026-02-15T00:00:00Z",
-                },
-            )
+                }
+                for i in range(count)
+            ],
+        )
 
     @pytest.mark.asyncio
     async def test_flags_high_alignment(self, mock_db, monkeypatch):
@@ -24,16 +24,18 @@ class TestBestPerforming:
     def test_falls_back_with_insufficient_data(self, mock_db):
         resolver, prompt, v1, v2, v3 = self._setup(mock_db)
         # Only 2 uses (below threshold of 3)
-        for _ in range(2):
-            mock_db.insert(
-                "prompt_usage_log",
+        mock_db.insert_many(
+            "prompt_usage_log",
+            [
                 {
                     "prompt_id": str(prompt["id"]),
                     "version_id": v1["id"],
                     "agent_id": "test",
                     "outcome": "success",
-                },
-            )
+                }
+            ]
+            * 2,
+        )
         result = resolver.resolve("perf-test", strategy="best_performing")
         assert result["version"] == 3  # fallback to latest
 
@@ -41,41 +43,21 @@ class TestBestPerforming:
         resolver, prompt, v1, v2, v3 = self._setup(mock_db)
         pid = str(prompt["id"])
 
-        # v1: 2/5 success (40%)
-        for i in range(5):
-            mock_db.insert(
-                "prompt_usage_log",
+        # v1: 2/5 success (40%), v2: 4/5 (80%) — best, v3: 3/5 (60%)
+        successes = {v1["id"]: 2, v2["id"]: 4, v3["id"]: 3}
+        mock_db.insert_many(
+            "prompt_usage_log",
+            [
                 {
                     "prompt_id": pid,
-                    "version_id": v1["id"],
-                    "agent_id": "test",
-                    "outcome": "success" if i < 2 else "failure",
-                },
-            )
-
-        # v2: 4/5 success (80%) — best
-        for i in range(5):
-            mock_db.insert(
-                "prompt_usage_log",
-                {
-                    "prompt_id": pid,
-                    "version_id": v2["id"],
-                    "agent_id": "test",
-                    "outcome": "success" if i < 4 else "failure",
-                },
-            )
-
-        # v3: 3/5 success (60%)
-        for i in range(5):
-            mock_db.insert(
-                "prompt_usage_log",
-                {
-                    "prompt_id": pid,
-                    "version_id": v3["id"],
+                    "version_id": version_id,
                     "agent_id": "test",
-                    "outcome": "success" if i < 3 else "failure",
-                },
-            )
+                    "outcome": "success" if i < wins else "failure",
+                }
+                for version_id, wins in successes.items()
+                for i in range(5)
+            ],
+        )
 
         result = resolver.resolve("perf-test", strategy="best_performing")
         assert result["version"] == 2  # v2 has highest success rate
@@ -1,214 +1,223 @@
 """Tests for branch management."""
 
+import re
+
 import pytest
 
 from prompt_forge.core.registry import PromptRegistry
 from prompt_forge.core.vcs import VersionControl
+from tests.conftest import MockSupabaseClient, load_json
+
+
+@pytest.fixture(scope="class")
+def _branch_baseline(sample_content):
+    """A prompt with one main-branch version, seeded once and snapshotted."""
+    db = MockSupabaseClient()
+    prompt = PromptRegistry(db).create_prompt(
+        slug="test-branch", name="Test", type="persona", content=sample_content
+    )
+    return str(prompt["id"]), db.snapshot()
+
+
+@pytest.fixture(scope="class")
+def _vcs(shared_db):
+    return VersionControl(shared_db)
+
+
+@pytest.fixture
+def seeded_vcs(_vcs, _branch_baseline, mock_db):
+    """(vcs, prompt id) over a fresh restore of the seeded baseline."""
+    pid, state = _branch_baseline
+    mock_db.restore(state)
+    return _vcs, pid
+
+
+_ALREADY_EXISTS = re.compile("already exists")
+
+# Shared empty variables/metadata; nothing on the branch paths edits them in place
+_EMPTY: dict = {}
+
+# Minimal single-section content used to seed the branch API tests
+_DEFAULT_CONTENT = {
+    "sections": [{"id": "identity", "label": "Identity", "content": "Test"}],
+    "variables": _EMPTY,
+    "metadata": _EMPTY,
+}
+
+# Adds a new section on the experiment branch
+_EXP_CONTENT = {
+    "sections": [
+        {"id": "identity", "label": "Identity", "content": "Updated identity"},
+        {"id": "new_section", "label": "New", "content": "Brand new"},
+    ],
+    "variables": {"new_var": "value"},
+    "metadata": _EMPTY,
+}
+
+
+@pytest.fixture(scope="class")
+def _merge_baseline(_branch_baseline):
+    """``_branch_baseline`` plus an 'experiment' branch carrying ``_EXP_CONTENT``.
+
+    Every merge strategy runs against a restore of this one state.
+    """
+    pid, state = _branch_baseline
+    db = MockSupabaseClient()
+    db.restore(state)
+    vcs = VersionControl(db)
+    vcs.create_branch(pid, "experiment")
+    vcs.commit(pid, _EXP_CONTENT, "Experiment changes", "author", "experiment")
+    return pid, db.snapshot()
+
+
+# sample_content with _EXP_CONTENT overlaid: experiment wins on "identity", main keeps
+# "skills"/"constraints", and the new section and variable are appended
+_EXPECTED_SECTION_MERGE = {
+    "sections": [
+        {"id": "identity", "label": "Identity", "content": "Updated identity"},
+        {"id": "skills", "label": "Skills", "content": "You excel at Python and security."},
+        {"id": "constraints", "label": "Constraints", "content": "Be concise."},
+        {"id": "new_section", "label": "New", "content": "Brand new"},
+    ],
+    "variables": {"project_name": "{{project_name}}", "new_var": "value"},
+    "metadata": {"estimated_tokens": 50},
+}
 
 
 class TestBranchManagement:
-    def _setup(self, mock_db, sample_content):
-        registry = PromptRegistry(mock_db)
-        vcs = VersionControl(mock_db)
-        prompt = registry.create_prompt(
-            slug="test-branch", name="Test", type="persona", content=sample_content
-        )
-        return vcs, prompt
-
-    def test_create_branch(self, mock_db, sample_content):
-        vcs, prompt = self._setup(mock_db, sample_content)
-        branch = vcs.create_branch(str(prompt["id"]), "experiment")
+    def test_create_branch(self, seeded_vcs):
+        vcs, pid = seeded_vcs
+        branch = vcs.create_branch(pid, "experiment")
         assert branch["name"] == "experiment"
         assert branch["status"] == "active"
 
-    def test_create_branch_duplicate_raises(self, mock_db, sample_content):
-        vcs, prompt = self._setup(mock_db, sample_content)
-        vcs.create_branch(str(prompt["id"]), "experiment")
-        with pytest.raises(ValueError, match="already exists"):
-            vcs.create_branch(str(prompt["id"]), "experiment")
+    def test_create_branch_duplicate_raises(self, seeded_vcs):
+        vcs, pid = seeded_vcs
+        vcs.create_branch(pid, "experiment")
+        with pytest.raises(ValueError, match=_ALREADY_EXISTS):
+            vcs.create_branch(pid, "experiment")
 
-    def test_create_branch_copies_content(self, mock_db, sample_content):
-        vcs, prompt = self._setup(mock_db, sample_content)
-        vcs.create_branch(str(prompt["id"]), "experiment")
-        history = vcs.history(str(prompt["id"]), branch="experiment")
+    def test_create_branch_copies_content(self, seeded_vcs, sample_content):
+        vcs, pid = seeded_vcs
+        vcs.create_branch(pid, "experiment")
+        history = vcs.history(pid, branch="experiment")
         assert len(history) == 1
         assert history[0]["content"] == sample_content
 
-    def test_list_branches(self, mock_db, sample_content):
-        vcs, prompt = self._setup(mock_db, sample_content)
-        vcs.create_branch(str(prompt["id"]), "exp-1")
-        vcs.create_branch(str(prompt["id"]), "exp-2")
-        branches = vcs.list_branches(str(prompt["id"]))
+    def test_list_branches(self, seeded_vcs):
+        vcs, pid = seeded_vcs
+        vcs.create_branch(pid, "exp-1")
+        vcs.create_branch(pid, "exp-2")
+        branches = vcs.list_branches(pid)
         assert len(branches) == 2
         names = {b["name"] for b in branches}
         assert names == {"exp-1", "exp-2"}
 
-    def test_merge_theirs(self, mock_db, sample_content):
-        vcs, prompt = self._setup(mock_db, sample_content)
-        pid = str(prompt["id"])
-        vcs.create_branch(pid, "experiment")
-
-        new_content = {
-            "sections": [{"id": "identity", "label": "Identity", "content": "New identity"}],
-            "variables": {},
-            "metadata": {},
-        }
-        vcs.commit(pid, new_content, "Update on experiment", "author", "experiment")
-
-        merged = vcs.merge_branch(pid, "experiment", "main", strategy="theirs")
-        assert merged["content"] == new_content
-
-    def test_merge_ours(self, mock_db, sample_content):
-        vcs, prompt = self._setup(mock_db, sample_content)
-        pid = str(prompt["id"])
-        vcs.create_branch(pid, "experiment")
-
-        vcs.commit(pid, {"sections": []}, "Update experiment", "author", "experiment")
-
-        merged = vcs.merge_branch(pid, "experiment", "main", strategy="ours")
-        # Should keep main's content (sample_content)
-        assert merged["content"] == sample_content
-
-    def test_merge_section_merge(self, mock_db, sample_content):
-        vcs, prompt = self._setup(mock_db, sample_content)
-        pid = str(prompt["id"])
-        vcs.create_branch(pid, "experiment")
-
-        # Add a new section on experiment
-        exp_content = {
-            "sections": [
-                {"id": "identity", "label": "Identity", "content": "Updated identity"},
-                {"id": "new_section", "label": "New", "content": "Brand new"},
-            ],
-            "variables": {"new_var": "value"},
-            "metadata": {},
-        }
-        vcs.commit(pid, exp_content, "Experiment changes", "author", "experiment")
-
-        merged = vcs.merge_branch(pid, "experiment", "main", strategy="section_merge")
-        merged_ids = {s["id"] for s in merged["content"]["sections"]}
-        # Should have sections from both
-        assert "identity" in merged_ids
-        assert "new_section" in merged_ids
-        assert "skills" in merged_ids  # from main
-        assert merged["content"]["variables"].get("new_var") == "value"
-
-    def test_merge_marks_branch_merged(self, mock_db, sample_content):
-        vcs, prompt = self._setup(mock_db, sample_content)
-        pid = str(prompt["id"])
+    @pytest.mark.slow
+    @pytest.mark.parametrize(
+        ("strategy", "check"),
+        [
+            pytest.param("theirs", lambda merged, main: merged == _EXP_CONTENT, id="theirs"),
+            # Should keep main's content (sample_content)
+            pytest.param("ours", lambda merged, main: merged == main, id="ours"),
+            pytest.param(
+                "section_merge",
+                lambda merged, main: merged == _EXPECTED_SECTION_MERGE,
+                id="section_merge",
+            ),
+        ],
+    )
+    def test_merge_strategy(self, _vcs, _merge_baseline, mock_db, sample_content, strategy, check):
+        pid, state = _merge_baseline
+        mock_db.restore(state)
+
+        merged = _vcs.merge_branch(pid, "experiment", "main", strategy=strategy)
+        assert check(merged["content"], sample_content)
+
+    @pytest.mark.slow
+    def test_merge_marks_branch_merged(self, seeded_vcs):
+        vcs, pid = seeded_vcs
         vcs.create_branch(pid, "experiment")
         vcs.merge_branch(pid, "experiment", "main")
-        branches = vcs.list_branches(pid)
-        exp = [b for b in branches if b["name"] == "experiment"][0]
+        exp = next(b for b in vcs.list_branches(pid) if b["name"] == "experiment")
         assert exp["status"] == "merged"
 
 
 class TestBranchAPI:
-    def test_create_branch_api(self, client):
+    async def test_create_branch_api(self, asgi_client, seed_prompt):
         # Create a prompt first
-        client.post(
-            "/api/v1/prompts",
-            json={
-                "slug": "branch-api-test",
-                "name": "Branch API Test",
-                "type": "persona",
-                "content": {
-                    "sections": [{"id": "identity", "label": "Identity", "content": "Test"}],
-                    "variables": {},
-                    "metadata": {},
-                },
-            },
+        seed_prompt("branch-api-test", "Branch API Test", "persona", content=_DEFAULT_CONTENT)
+        resp = await asgi_client.post(
+            "/api/v1/prompts/branch-api-test/branches", json={"name": "experiment"}
         )
-        resp = client.post("/api/v1/prompts/branch-api-test/branches", json={"name": "experiment"})
         assert resp.status_code == 201
-        assert resp.json()["name"] == "experiment"
-
-    def test_list_branches_api(self, client):
-        client.post(
-            "/api/v1/prompts",
-            json={
-                "slug": "branch-list-test",
-                "name": "Test",
-                "type": "persona",
-                "content": {
-                    "sections": [{"id": "identity", "label": "Identity", "content": "Test"}],
-                    "variables": {},
-                    "metadata": {},
-                },
-            },
-        )
-        client.post("/api/v1/prompts/branch-list-test/branches", json={"name": "exp-1"})
-        client.post("/api/v1/prompts/branch-list-test/branches", json={"name": "exp-2"})
-        resp = client.get("/api/v1/prompts/branch-list-test/branches")
+        assert load_json(resp)["name"] == "experiment"
+
+    async def test_list_branches_api(self, asgi_client, seed_prompt, mock_db):
+        prompt = seed_prompt("branch-list-test", "Test", "persona", content=_DEFAULT_CONTENT)
+        vcs = VersionControl(mock_db)
+        for name in ("exp-1", "exp-2"):
+            vcs.create_branch(str(prompt["id"]), name)
+        resp = await asgi_client.get("/api/v1/prompts/branch-list-test/branches")
         assert resp.status_code == 200
-        assert len(resp.json()) == 2
-
-    def test_merge_branch_api(self, client):
-        client.post(
-            "/api/v1/prompts",
-            json={
-                "slug": "branch-merge-test",
-                "name": "Test",
-                "type": "persona",
-                "content": {
-                    "sections": [{"id": "identity", "label": "Identity", "content": "Test"}],
-                    "variables": {},
-                    "metadata": {},
-                },
-            },
+        assert len(load_json(resp)) == 2
+
+    @pytest.mark.slow
+    async def test_merge_branch_api(self, asgi_client, seed_prompt):
+        seed_prompt("branch-merge-test", "Test", "persona", content=_DEFAULT_CONTENT)
+        await asgi_client.post(
+            "/api/v1/prompts/branch-merge-test/branches", json={"name": "feature"}
         )
-        client.post("/api/v1/prompts/branch-merge-test/branches", json={"name": "feature"})
-        resp = client.post(
+        resp = await asgi_client.post(
             "/api/v1/prompts/branch-merge-test/branches/feature/merge",
             json={"strategy": "theirs"},
         )
         assert resp.status_code == 200
 
-    def test_branch_not_found(self, client):
-        resp = client.post("/api/v1/prompts/nonexistent/branches", json={"name": "x"})
+    async def test_branch_not_found(self, asgi_client):
+        resp = await asgi_client.post("/api/v1/prompts/nonexistent/branches", json={"name": "x"})
         assert resp.status_code == 404
 
 
 class TestNewBranchEndpoints:
-    def test_branch_diff_api(self, client):
+    @pytest.mark.slow
+    async def test_branch_diff_api(self, asgi_client, seed_prompt, mock_db):
         # Create a prompt
-        client.post(
-            "/api/v1/prompts",
-            json={
-                "slug": "branch-diff-test",
-                "name": "Branch Diff Test",
-                "type": "persona",
-                "content": {
-                    "sections": [
-                        {"id": "identity", "label": "Identity", "content": "Original content"}
-                    ],
-                    "variables": {"var1": "value1"},
-                    "metadata": {},
-                },
+        prompt = seed_prompt(
+            "branch-diff-test",
+            "Branch Diff Test",
+            "persona",
+            content={
+                "sections": [
+                    {"id": "identity", "label": "Identity", "content": "Original content"}
+                ],
+                "variables": {"var1": "value1"},
+                "metadata": _EMPTY,
             },
         )
 
         # Create a branch
-        client.post("/api/v1/prompts/branch-diff-test/branches", json={"name": "feature"})
+        await asgi_client.post(
+            "/api/v1/prompts/branch-diff-test/branches", json={"name": "feature"}
+        )
 
         # Update the branch with new content
-        client.post(
-            "/api/v1/prompts/branch-diff-test/versions",
-            json={
-                "content": {
-                    "sections": [{"id": "identity", "label": "Identity", "content": "New content"}],
-                    "variables": {"var1": "value1", "var2": "value2"},
-                    "metadata": {},
-                },
-                "message": "Update feature branch",
-                "branch": "feature",
+        VersionControl(mock_db).commit(
+            str(prompt["id"]),
+            {
+                "sections": [{"id": "identity", "label": "Identity", "content": "New content"}],
+                "variables": {"var1": "value1", "var2": "value2"},
+                "metadata": _EMPTY,
             },
+            "Update feature branch",
+            "author",
+            "feature",
         )
 
         # Test the diff endpoint
-        resp = client.get("/api/v1/prompts/branch-diff-test/branches/feature/diff")
+        resp = await asgi_client.get("/api/v1/prompts/branch-diff-test/branches/feature/diff")
         assert resp.status_code == 200
-        data = resp.json()
+        data = load_json(resp)
         assert data["branch_name"] == "feature"
         assert "diff_summary" in data
         assert "current_content" in data
@@ -216,64 +225,36 @@ class TestNewBranchEndpoints:
         assert data["current_content"]["sections"][0]["content"] == "Original content"
         assert data["proposed_content"]["sections"][0]["content"] == "New content"
 
-    def test_branch_diff_branch_not_found(self, client):
-        client.post(
-            "/api/v1/prompts",
-            json={
-                "slug": "diff-404-test",
-                "name": "Test",
-                "type": "persona",
-                "content": {
-                    "sections": [{"id": "identity", "label": "Identity", "content": "Test"}],
-                    "variables": {},
-                    "metadata": {},
-                },
-            },
-        )
-        resp = client.get("/api/v1/prompts/diff-404-test/branches/nonexistent/diff")
-        assert resp.status_code == 404
-
-    def test_branch_reject_api(self, client):
+    async def test_branch_reject_api(self, asgi_client, seed_prompt):
         # Create a prompt
-        client.post(
-            "/api/v1/prompts",
-            json={
-                "slug": "branch-reject-test",
-                "name": "Branch Reject Test",
-                "type": "persona",
-                "content": {
-                    "sections": [{"id": "identity", "label": "Identity", "content": "Test"}],
-                    "variables": {},
-                    "metadata": {},
-                },
-            },
-        )
+        seed_prompt("branch-reject-test", "Branch Reject Test", "persona", content=_DEFAULT_CONTENT)
 
         # Create a branch
-        client.post("/api/v1/prompts/branch-reject-test/branches", json={"name": "unwanted"})
+        await asgi_client.post(
+            "/api/v1/prompts/branch-reject-test/branches", json={"name": "unwanted"}
+        )
 
         # Reject the branch
-        resp = client.post(
+        resp = await asgi_client.post(
             "/api/v1/prompts/branch-reject-test/branches/unwanted/reject",
             json={"reason": "Not needed anymore"},
         )
         assert resp.status_code == 200
-        data = resp.json()
+        data = load_json(resp)
         assert data["status"] == "rejected"
 
-    def test_branch_reject_branch_not_found(self, client):
-        client.post(
-            "/api/v1/prompts",
-            json={
-                "slug": "reject-404-test",
-                "name": "Test",
-                "type": "persona",
-                "content": {
-                    "sections": [{"id": "identity", "label": "Identity", "content": "Test"}],
-                    "variables": {},
-                    "metadata": {},
-                },
-            },
+    @pytest.mark.parametrize(
+        ("method", "path", "body"),
+        [
+            pytest.param("GET", "/branches/nonexistent/diff", None, id="diff"),
+            pytest.param("POST", "/branches/nonexistent/reject", {}, id="reject"),
+        ],
+    )
+    async def test_branch_sub_resource_not_found(
+        self, asgi_client, seed_prompt, method, path, body
+    ):
+        seed_prompt("branch-404-test", "Test", "persona", content=_DEFAULT_CONTENT)
+        resp = await asgi_client.request(
+            method, f"/api/v1/prompts/branch-404-test{path}", json=body
         )
-        resp = client.post("/api/v1/prompts/reject-404-test/branches/nonexistent/reject", json={})
         assert resp.status_code == 404
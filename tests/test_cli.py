@@ -3,59 +3,83 @@
 from __future__ import annotations
 
 import json
-from unittest.mock import MagicMock, patch
+from collections.abc import Callable, Iterator
+from typing import Any
+from unittest.mock import MagicMock
 
+import click
 import pytest
-from click.testing import CliRunner
+from click.testing import CliRunner, Result
 
+from prompt_forge.cli.client import ForgeClient
 from prompt_forge.cli.main import cli
 
 
+@pytest.fixture(scope="session")
+def _forge_client() -> MagicMock:
+    return MagicMock(spec=ForgeClient)
+
+
 @pytest.fixture
-def runner():
+def mock_client(_forge_client) -> Iterator[MagicMock]:
+    """Session-wide fake ForgeClient, handed to the CLI as ``ctx.obj``."""
+    yield _forge_client
+    _forge_client.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
     return CliRunner()
 
 
 @pytest.fixture
-def mock_client():
-    with patch("prompt_forge.cli.main.ForgeClient") as MockClass:
-        client = MagicMock()
-        MockClass.return_value = client
-        yield client
+def invoke(runner, mock_client) -> Callable[..., Result]:
+    return lambda args, **kwargs: runner.invoke(cli, args, obj=mock_client, **kwargs)
+
+
+@pytest.fixture
+def run_command(mock_client) -> Callable[..., None]:
+    """Call a command's callback directly, for tests that only check the client calls."""
+
+    def _run(path: str, **params: Any) -> None:
+        command = cli
+        for name in path.split():
+            command = command.commands[name]
+        with click.Context(cli, obj=mock_client) as ctx:
+            ctx.invoke(command, **params)
+
+    return _run
 
 
 class TestPromptCommands:
-    def test_prompt_list(self, runner, mock_client):
+    def test_prompt_list(self, invoke, mock_client):
         mock_client.list_prompts.return_value = [
             {"slug": "test", "name": "Test", "type": "persona", "tags": [], "parent_slug": None}
         ]
-        result = runner.invoke(cli, ["prompt", "list"])
+        result = invoke(["prompt", "list"])
         assert result.exit_code == 0
         assert "test" in result.output
 
-    def test_prompt_create(self, runner, mock_client):
+    def test_prompt_create(self, run_command, mock_client):
         mock_client.create_prompt.return_value = {"slug": "new-prompt", "name": "New"}
-        result = runner.invoke(
-            cli, ["prompt", "create", "--slug", "new-prompt", "--name", "New", "--type", "persona"]
-        )
-        assert result.exit_code == 0
+        run_command("prompt create", slug="new-prompt", name="New", prompt_type="persona")
         mock_client.create_prompt.assert_called_once()
 
-    def test_prompt_show(self, runner, mock_client):
+    def test_prompt_show(self, invoke, mock_client):
         mock_client.get_prompt.return_value = {"slug": "test", "name": "Test", "type": "persona"}
-        result = runner.invoke(cli, ["prompt", "show", "test"])
+        result = invoke(["prompt", "show", "test"])
         assert result.exit_code == 0
         assert "test" in result.output
 
-    def test_prompt_archive(self, runner, mock_client):
-        result = runner.invoke(cli, ["prompt", "archive", "test"])
+    def test_prompt_archive(self, invoke, mock_client):
+        result = invoke(["prompt", "archive", "test"])
         assert result.exit_code == 0
         mock_client.archive_prompt.assert_called_once_with("test")
         assert "Archived" in result.output
 
 
 class TestVersionCommands:
-    def test_version_history(self, runner, mock_client):
+    def test_version_history(self, invoke, mock_client):
         mock_client.list_versions.return_value = [
             {
                 "version": 1,
@@ -65,63 +89,63 @@ class TestVersionCommands:
                 "created_at": "2025-01-01",
             }
         ]
-        result = runner.invoke(cli, ["version", "history", "test"])
+        result = invoke(["version", "history", "test"])
         assert result.exit_code == 0
         assert "init" in result.output
 
-    def test_version_commit_from_stdin(self, runner, mock_client):
+    def test_version_commit_from_stdin(self, invoke, mock_client):
         mock_client.commit_version.return_value = {"version": 2, "message": "update"}
         content = json.dumps({"sections": [], "variables": {}, "metadata": {}})
-        result = runner.invoke(cli, ["version", "commit", "test", "-m", "update"], input=content)
+        result = invoke(["version", "commit", "test", "-m", "update"], input=content)
         assert result.exit_code == 0
         mock_client.commit_version.assert_called_once()
 
-    def test_version_diff(self, runner, mock_client):
+    def test_version_diff(self, run_command, mock_client):
         mock_client.diff_versions.return_value = {"changes": [], "summary": "No changes"}
-        result = runner.invoke(cli, ["version", "diff", "test", "1", "2"])
-        assert result.exit_code == 0
+        run_command("version diff", slug="test", v1=1, v2=2)
+        mock_client.diff_versions.assert_called_once_with("test", 1, 2, "main")
 
-    def test_version_rollback(self, runner, mock_client):
+    def test_version_rollback(self, run_command, mock_client):
         mock_client.rollback.return_value = {"version": 3, "message": "Rollback to version 1"}
-        result = runner.invoke(cli, ["version", "rollback", "test", "1"])
-        assert result.exit_code == 0
+        run_command("version rollback", slug="test", version_num=1)
+        mock_client.rollback.assert_called_once_with("test", 1, "cli")
 
 
 class TestComposeCommand:
-    def test_compose(self, runner, mock_client):
+    def test_compose(self, invoke, mock_client):
         mock_client.compose.return_value = {
             "prompt": "You are a helpful assistant.",
             "manifest": {},
             "warnings": [],
         }
-        result = runner.invoke(cli, ["compose", "--persona", "helper"])
+        result = invoke(["compose", "--persona", "helper"])
         assert result.exit_code == 0
         assert "helpful assistant" in result.output
 
-    def test_compose_with_warnings(self, runner, mock_client):
+    def test_compose_with_warnings(self, run_command, mock_client):
         mock_client.compose.return_value = {
             "prompt": "Text",
             "manifest": {},
             "warnings": ["Unresolved variables: name"],
         }
-        result = runner.invoke(cli, ["compose", "--persona", "helper"])
-        assert result.exit_code == 0
+        run_command("compose", persona="helper")
+        mock_client.compose.assert_called_once()
 
 
 class TestSearchCommand:
-    def test_search(self, runner, mock_client):
+    def test_search(self, invoke, mock_client):
         mock_client.search.return_value = [
             {"slug": "found", "name": "Found", "type": "persona", "tags": ["ai"]}
         ]
-        result = runner.invoke(cli, ["search", "found"])
+        result = invoke(["search", "found"])
         assert result.exit_code == 0
         assert "found" in result.output
 
 
 class TestJsonOutput:
-    def test_json_format(self, runner, mock_client):
+    def test_json_format(self, invoke, mock_client):
         mock_client.list_prompts.return_value = [{"slug": "test", "name": "Test"}]
-        result = runner.invoke(cli, ["--format", "json", "prompt", "list"])
+        result = invoke(["--format", "json", "prompt", "list"])
         assert result.exit_code == 0
         data = json.loads(result.output)
         assert isinstance(data, list)
@@ -34,6 +34,13 @@ class TestStructuralDiffer:
         assert changes[0]["type"] == "modified"
         assert 0 < changes[0]["similarity"] < 1
 
+    def test_modified_section_similarity_long_text(self):
+        # Over 200 chars, where difflib's autojunk heuristic would report 0.0
+        old = {"sections": [{"id": "a", "content": "x" * 150 + "ab" * 50}]}
+        new = {"sections": [{"id": "a", "content": "ab" * 50 + "x" * 150}]}
+        result = self.differ.diff(old, new)
+        assert result["changes"][0]["similarity"] == 0.6
+
     def test_variable_changes(self):
         old = {"sections": [], "variables": {"a": "1"}}
         new = {"sections": [], "variables": {"a": "2"}}
@@ -90,9 +90,9 @@ class TestEffectivenessUpdate:
 
 class TestEffectivenessSummary:
     def _seed(self, mock_db):
-        for i in range(5):
-            mock_db.insert(
-                "prompt_effectiveness",
+        mock_db.insert_many(
+            "prompt_effectiveness",
+            [
                 {
                     "session_uuid": f"sess-{i}",
                     "agent_id": "developer" if i < 3 else "reviewer",
@@ -104,8 +104,10 @@ class TestEffectivenessSummary:
                     "effectiveness": (0.7 + i * 0.05) / (0.03 + i * 0.01),
                     "correction_count": i % 2,
                     "created_at": "2026-02-15T00:00:00Z",
-                },
-            )
+                }
+                for i in range(5)
+            ],
+        )
 
     def test_summary_by_agent(self, client, mock_db):
         self._seed(mock_db)
@@ -128,21 +130,23 @@ class TestEffectivenessSummary:
 
 class TestModelTierEffectiveness:
     def _seed_tiers(self, mock_db):
-        for tier, count in [("economy", 5), ("standard", 10), ("premium", 3)]:
-            for i in range(count):
-                mock_db.insert(
-                    "prompt_effectiveness",
-                    {
-                        "session_uuid": f"sess-{tier}-{i}",
-                        "agent_id": "developer",
-                        "model_id": f"model-{tier}",
-                        "model_tier": tier,
-                        "correction_count": 1 if tier == "economy" and i < 3 else 0,
-                        "outcome_score": 0.7 if tier == "economy" else 0.9,
-                        "effectiveness": 10.0 if tier == "economy" else 15.0,
-                        "created_at": "2026-02-15T00:00:00Z",
-                    },
-                )
+        mock_db.insert_many(
+            "prompt_effectiveness",
+            [
+                {
+                    "session_uuid": f"sess-{tier}-{i}",
+                    "agent_id": "developer",
+                    "model_id": f"model-{tier}",
+                    "model_tier": tier,
+                    "correction_count": 1 if tier == "economy" and i < 3 else 0,
+                    "outcome_score": 0.7 if tier == "economy" else 0.9,
+                    "effectiveness": 10.0 if tier == "economy" else 15.0,
+                    "created_at": "2026-02-15T00:00:00Z",
+                }
+                for tier, count in [("economy", 5), ("standard", 10), ("premium", 3)]
+                for i in range(count)
+            ],
+        )
 
     def test_model_tiers(self, client, mock_db):
         self._seed_tiers(mock_db)
@@ -158,9 +162,9 @@ class TestModelTierEffectiveness:
 
 class TestMissionCostBreakdown:
     def _seed_mission(self, mock_db):
-        for i in range(4):
-            mock_db.insert(
-                "prompt_effectiveness",
+        mock_db.insert_many(
+            "prompt_effectiveness",
+            [
                 {
                     "session_uuid": f"sess-m-{i}",
                     "agent_id": "developer",
@@ -172,8 +176,10 @@ class TestMissionCostBreakdown:
                     "outcome_score": 0.8,
                     "correction_count": 0,
                     "created_at": "2026-02-15T00:00:00Z",
-                },
-            )
+                }
+                for i in range(4)
+            ],
+        )
 
     def test_mission_breakdown(self, client, mock_db):
         self._seed_mission(mock_db)
@@ -193,9 +199,9 @@ class TestMissionCostBreakdown:
 
 class TestDiscoveryAccuracy:
     def _seed_discovery(self, mock_db):
-        for i, score in enumerate([0.5, 0.6, 0.7, 0.85]):
-            mock_db.insert(
-                "prompt_effectiveness",
+        mock_db.insert_many(
+            "prompt_effectiveness",
+            [
                 {
                     "session_uuid": f"sess-d-{i}",
                     "agent_id": "developer",
@@ -203,8 +209,10 @@ class TestDiscoveryAccuracy:
                     "mission_id": "mission-da",
                     "outcome_score": score,
                     "created_at": f"2026-02-1{i + 2}T00:00:00Z",
-                },
-            )
+                }
+                for i, score in enumerate([0.5, 0.6, 0.7, 0.85])
+            ],
+        )
 
     def test_discovery_accuracy(self, client, mock_db):
         self._seed_discovery(mock_db)
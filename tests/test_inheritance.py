@@ -8,27 +8,32 @@ from prompt_forge.core.composer import CompositionEngine
 from prompt_forge.core.registry import PromptRegistry
 from prompt_forge.core.resolver import PromptResolver
 from prompt_forge.core.vcs import VersionControl
-from tests.conftest import MockSupabaseClient
+
+
+@pytest.fixture(scope="module")
+def _services(shared_db):
+    """Registry, VCS and resolver over the session mock, built once per module."""
+    return PromptRegistry(shared_db), VersionControl(shared_db), PromptResolver(shared_db)
 
 
 @pytest.fixture
-def db():
-    return MockSupabaseClient()
+def db(mock_db):
+    return mock_db
 
 
 @pytest.fixture
-def registry(db):
-    return PromptRegistry(db)
+def registry(_services, db):
+    return _services[0]
 
 
 @pytest.fixture
-def vcs(db):
-    return VersionControl(db)
+def vcs(_services, db):
+    return _services[1]
 
 
 @pytest.fixture
-def resolver(db):
-    return PromptResolver(db)
+def resolver(_services, db):
+    return _services[2]
 
 
 def _make_content(sections: dict[str, str]) -> dict:
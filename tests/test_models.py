@@ -1,5 +1,7 @@
 """Tests for Pydantic model validation."""
 
+from uuid import uuid4
+
 import pytest
 from pydantic import ValidationError
 
@@ -44,25 +46,25 @@ class TestComposeRequest:
         assert len(r.skills) == 1
 
 
+# Any well-formed ids will do; nothing here depends on them being distinct per test
+_PROMPT_ID, _VERSION_ID = uuid4(), uuid4()
+
+
 class TestUsageLogCreate:
     def test_valid_outcome(self):
-        from uuid import uuid4
-
         u = UsageLogCreate(
-            prompt_id=uuid4(),
-            version_id=uuid4(),
+            prompt_id=_PROMPT_ID,
+            version_id=_VERSION_ID,
             agent_id="worker-1",
             outcome="success",
         )
         assert u.outcome == "success"
 
     def test_invalid_outcome(self):
-        from uuid import uuid4
-
         with pytest.raises(ValidationError):
             UsageLogCreate(
-                prompt_id=uuid4(),
-                version_id=uuid4(),
+                prompt_id=_PROMPT_ID,
+                version_id=_VERSION_ID,
                 agent_id="worker-1",
                 outcome="bad",
             )
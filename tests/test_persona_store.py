@@ -39,7 +39,7 @@ def test_create_first_persona_prompt_version(persona_store: PersonaPromptStore):
     assert result.created_at is not None
 
 
-def test_create_second_persona_prompt_version(persona_store: PersonaPromptStore, mock_db):
+def test_create_second_persona_prompt_version(persona_store: PersonaPromptStore):
     """Test creating a second version marks previous as not latest."""
     template1 = "You are a developer v1. Context: {{context}}"
     template2 = "You are a developer v2. Context: {{context}}"
@@ -49,12 +49,6 @@ def test_create_second_persona_prompt_version(persona_store: PersonaPromptStore,
     assert first.version == 1
     assert first.is_latest is True
 
-    # Mock the bulk update operation that sets is_latest=False for previous versions
-    # Since our mock client doesn't handle the complex query, we'll manually update
-    for row in mock_db._tables["persona_prompts"]:
-        if row["persona"] == "developer" and row["version"] < 2:
-            row["is_latest"] = False
-
     # Create second version
     second = persona_store.create_persona_prompt_version("developer", template2)
     assert second.version == 2
@@ -72,16 +66,11 @@ def test_create_second_persona_prompt_version(persona_store: PersonaPromptStore,
     assert latest.is_latest is True
 
 
-def test_get_latest_after_multiple_versions(persona_store: PersonaPromptStore, mock_db):
+def test_get_latest_after_multiple_versions(persona_store: PersonaPromptStore):
     """Test getting latest version after creating multiple versions."""
     templates = ["Template v1", "Template v2", "Template v3"]
 
-    for i, template in enumerate(templates, 1):
-        # Mock the bulk update for previous versions
-        for row in mock_db._tables["persona_prompts"]:
-            if row["persona"] == "tester" and row["version"] < i:
-                row["is_latest"] = False
-
+    for template in templates:
         persona_store.create_persona_prompt_version("tester", template)
 
     latest = persona_store.get_latest_persona_prompt("tester")
@@ -91,16 +80,11 @@ def test_get_latest_after_multiple_versions(persona_store: PersonaPromptStore, m
     assert latest.is_latest is True
 
 
-def test_list_persona_versions(persona_store: PersonaPromptStore, mock_db):
+def test_list_persona_versions(persona_store: PersonaPromptStore):
     """Test listing all versions of a persona."""
     templates = ["Version 1", "Version 2", "Version 3"]
 
-    for i, template in enumerate(templates, 1):
-        # Mock the bulk update for previous versions
-        for row in mock_db._tables["persona_prompts"]:
-            if row["persona"] == "reviewer" and row["version"] < i:
-                row["is_latest"] = False
-
+    for template in templates:
         persona_store.create_persona_prompt_version("reviewer", template)
 
     versions = persona_store.list_persona_versions("reviewer")
@@ -117,6 +101,38 @@ def test_list_persona_versions(persona_store: PersonaPromptStore, mock_db):
     assert versions[2].is_latest is False
 
 
+def test_create_version_clears_previous_latest(persona_store: PersonaPromptStore):
+    """Test that a version bump atomically clears is_latest on older versions."""
+    persona_store.create_persona_prompt_version("architect", "Template v1")
+    persona_store.create_persona_prompt_version("architect", "Template v2")
+    persona_store.create_persona_prompt_version("architect", "Template v3")
+
+    versions = persona_store.list_persona_versions("architect")
+    assert [v.version for v in versions] == [3, 2, 1]
+    assert [v.is_latest for v in versions] == [True, False, False]
+
+
+def test_iter_persona_versions_pages(persona_store: PersonaPromptStore):
+    """Test paging through versions with a trimmed projection."""
+    for i in range(5):
+        persona_store.create_persona_prompt_version("researcher", f"Template v{i + 1}")
+
+    rows = list(
+        persona_store.iter_persona_versions("researcher", page_size=2, columns="version,is_latest")
+    )
+    assert [r["version"] for r in rows] == [5, 4, 3, 2, 1]
+    assert set(rows[0]) == {"version", "is_latest"}
+
+
+@pytest.mark.parametrize("page_size", [0, -1])
+def test_iter_persona_versions_rejects_bad_page_size(
+    persona_store: PersonaPromptStore, page_size: int
+):
+    """Test that a non-positive page size is rejected instead of looping forever."""
+    with pytest.raises(ValueError, match="page_size"):
+        list(persona_store.iter_persona_versions("researcher", page_size=page_size))
+
+
 def test_list_persona_versions_empty(persona_store: PersonaPromptStore):
     """Test listing versions for non-existent persona."""
     versions = persona_store.list_persona_versions("nonexistent")
@@ -5,32 +5,43 @@ import pytest
 from prompt_forge.core.registry import PromptRegistry
 from prompt_forge.core.resolver import PromptResolver
 from prompt_forge.core.vcs import VersionControl
+from tests.conftest import MockSupabaseClient
+
+
+@pytest.fixture(scope="class")
+def _resolver_baseline():
+    """A prompt with three committed versions, seeded once and snapshotted."""
+    db = MockSupabaseClient()
+    prompt = PromptRegistry(db).create_prompt(slug="test", name="Test", type="persona")
+    vcs = VersionControl(db)
+    for v in (1, 2, 3):
+        vcs.commit(prompt["id"], {"v": v}, f"v{v}", "author")
+    return db.snapshot()
+
+
+@pytest.fixture(scope="class")
+def _resolver(shared_db):
+    return PromptResolver(shared_db)
+
+
+@pytest.fixture
+def resolver(_resolver, _resolver_baseline, mock_db):
+    """Resolver over a fresh restore of the seeded baseline."""
+    mock_db.restore(_resolver_baseline)
+    return _resolver
 
 
 class TestPromptResolver:
-    def _setup(self, mock_db):
-        registry = PromptRegistry(mock_db)
-        vcs = VersionControl(mock_db)
-        resolver = PromptResolver(mock_db)
-        prompt = registry.create_prompt(slug="test", name="Test", type="persona")
-        vcs.commit(prompt["id"], {"v": 1}, "v1", "author")
-        vcs.commit(prompt["id"], {"v": 2}, "v2", "author")
-        vcs.commit(prompt["id"], {"v": 3}, "v3", "author")
-        return resolver
-
-    def test_resolve_latest(self, mock_db):
-        resolver = self._setup(mock_db)
+    def test_resolve_latest(self, resolver):
         result = resolver.resolve("test")
         assert result["version"] == 3
 
-    def test_resolve_pinned(self, mock_db):
-        resolver = self._setup(mock_db)
+    def test_resolve_pinned(self, resolver):
         result = resolver.resolve("test", version=2, strategy="pinned")
         assert result["version"] == 2
         assert result["content"] == {"v": 2}
 
-    def test_resolve_pinned_no_version_raises(self, mock_db):
-        resolver = self._setup(mock_db)
+    def test_resolve_pinned_no_version_raises(self, resolver):
         with pytest.raises(ValueError, match="requires a version"):
             resolver.resolve("test", strategy="pinned")
 
@@ -39,8 +50,7 @@ class TestPromptResolver:
         with pytest.raises(ValueError, match="not found"):
             resolver.resolve("nonexistent")
 
-    def test_resolve_best_performing_fallback(self, mock_db):
-        resolver = self._setup(mock_db)
+    def test_resolve_best_performing_fallback(self, resolver):
         # Falls back to latest in Phase 1
         result = resolver.resolve("test", strategy="best_performing")
         assert result["version"] == 3
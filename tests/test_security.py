@@ -0,0 +1,27 @@
+"""Tests for security utilities."""
+
+import pytest
+
+from prompt_forge.utils.security import validate_slug
+
+
+class TestValidateSlug:
+    @pytest.mark.parametrize("slug", ["ab", "code-reviewer", "persona-2", "a" * 100])
+    def test_valid(self, slug):
+        assert validate_slug(slug) is True
+
+    @pytest.mark.parametrize(
+        "slug",
+        [
+            pytest.param("code-reviewer\n", id="trailing_newline"),
+            pytest.param("-reviewer", id="leading_hyphen"),
+            pytest.param("reviewer-", id="trailing_hyphen"),
+            pytest.param("a", id="single_char"),
+            pytest.param("Code-Reviewer", id="uppercase"),
+            pytest.param("a" * 101, id="too_long"),
+            pytest.param("code_reviewer", id="underscore"),
+            pytest.param("revéw", id="non_ascii"),
+        ],
+    )
+    def test_invalid(self, slug):
+        assert validate_slug(slug) is False
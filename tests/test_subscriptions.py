@@ -172,25 +172,18 @@ class TestTTLCleanup:
     def test_stale_subscriptions_removed(self, mock_db):
         """Test that stale subscriptions are identified correctly."""
 
-        # Insert a stale subscription
-        stale_time = (datetime.now(timezone.utc) - timedelta(days=8)).isoformat()
-        mock_db.insert(
+        # One stale subscription and one fresh one
+        now = datetime.now(timezone.utc)
+        mock_db.insert_many(
             "prompt_subscriptions",
-            {
-                "prompt_id": "fake-id",
-                "agent_id": "stale-agent",
-                "last_pulled_at": stale_time,
-            },
-        )
-        # Insert a fresh subscription
-        fresh_time = datetime.now(timezone.utc).isoformat()
-        mock_db.insert(
-            "prompt_subscriptions",
-            {
-                "prompt_id": "fake-id",
-                "agent_id": "fresh-agent",
-                "last_pulled_at": fresh_time,
-            },
+            [
+                {
+                    "prompt_id": "fake-id",
+                    "agent_id": agent_id,
+                    "last_pulled_at": (now - timedelta(days=age)).isoformat(),
+                }
+                for agent_id, age in (("stale-agent", 8), ("fresh-agent", 0))
+            ],
         )
 
         # Simulate cleanup logic
@@ -204,6 +197,27 @@ class TestTTLCleanup:
         assert len(remaining) == 1
         assert remaining[0]["agent_id"] == "fresh-agent"
 
+    def test_remove_stale_subscriptions(self, mock_db):
+        from prompt_forge.main import remove_stale_subscriptions
+
+        now = datetime.now(timezone.utc)
+        mock_db.insert_many(
+            "prompt_subscriptions",
+            [
+                {
+                    "prompt_id": "fake-id",
+                    "agent_id": agent_id,
+                    "last_pulled_at": (now - timedelta(days=age)).isoformat(),
+                }
+                for agent_id, age in (("stale-agent", 8), ("fresh-agent", 0))
+            ]
+            + [{"prompt_id": "fake-id", "agent_id": "never-pulled", "last_pulled_at": None}],
+        )
+
+        assert remove_stale_subscriptions(mock_db) == 2
+        remaining = mock_db.select("prompt_subscriptions")
+        assert [r["agent_id"] for r in remaining] == ["fresh-agent"]
+
 
 class TestSubscriberCount:
     def test_list_prompts_includes_subscriber_count(self, client):
@@ -219,5 +233,5 @@ class TestSubscriberCount:
         client.post("/api/v1/prompts/counted/subscribe", headers={"X-Agent-ID": "a2"})
         resp = client.get("/api/v1/prompts")
         prompts = resp.json()
-        counted = [p for p in prompts if p["slug"] == "counted"][0]
+        counted = next(p for p in prompts if p["slug"] == "counted")
         assert counted["subscriber_count"] == 2
@@ -16,9 +16,9 @@ class TestUsageAnalytics:
             str(prompt["id"]), {"sections": [], "variables": {}, "metadata": {}}, "v1", "author"
         )
 
-        for i in range(5):
-            mock_db.insert(
-                "prompt_usage_log",
+        mock_db.insert_many(
+            "prompt_usage_log",
+            [
                 {
                     "prompt_id": str(prompt["id"]),
                     "version_id": version["id"],
@@ -28,8 +28,10 @@ class TestUsageAnalytics:
                     "composition_manifest": None,
                     "feedback": None,
                     "resolved_at": "2026-02-12T00:00:00Z",
-                },
-            )
+                }
+                for i in range(5)
+            ],
+        )
 
         return str(prompt["id"]), version["id"]
 
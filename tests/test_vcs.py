@@ -1,5 +1,7 @@
 """Tests for version control system."""
 
+import pytest
+
 from prompt_forge.core.registry import PromptRegistry
 from prompt_forge.core.vcs import (
     VersionControl,
@@ -91,72 +93,68 @@ class TestVersionControl:
 class TestMergeContent:
     """Unit tests for merge_content."""
 
-    def test_adds_new_fields(self):
-        base = {"identity": "I am Kai", "voice": "Warm"}
-        patch = {"slack_id": "U123"}
-        result = merge_content(base, patch)
-        assert result == {"identity": "I am Kai", "voice": "Warm", "slack_id": "U123"}
-
-    def test_replaces_string_field(self):
-        base = {"voice": "Warm", "identity": "Kai"}
-        patch = {"voice": "Formal"}
-        result = merge_content(base, patch)
-        assert result["voice"] == "Formal"
-        assert result["identity"] == "Kai"
-
-    def test_replaces_array_atomically(self):
-        base = {"principles": ["Be kind", "Be honest"]}
-        patch = {"principles": ["Be kind", "Be honest", "Be brave"]}
-        result = merge_content(base, patch)
-        assert result["principles"] == ["Be kind", "Be honest", "Be brave"]
-
-    def test_preserves_omitted_fields(self):
-        base = {"a": 1, "b": 2, "c": 3}
-        patch = {"b": 20}
-        result = merge_content(base, patch)
-        assert result == {"a": 1, "b": 20, "c": 3}
-
-    def test_null_removes_field(self):
-        base = {"a": 1, "b": 2, "c": 3}
-        patch = {"b": None}
-        result = merge_content(base, patch)
-        assert result == {"a": 1, "c": 3}
-
-    def test_null_on_missing_field_is_noop(self):
-        base = {"a": 1}
-        patch = {"nonexistent": None}
-        result = merge_content(base, patch)
-        assert result == {"a": 1}
-
-    def test_deep_merges_objects(self):
-        base = {"meta": {"author": "mike", "version": 1}, "name": "test"}
-        patch = {"meta": {"version": 2, "reviewed": True}}
-        result = merge_content(base, patch)
-        assert result["meta"] == {"author": "mike", "version": 2, "reviewed": True}
-        assert result["name"] == "test"
-
-    def test_deep_merge_with_null_inside_object(self):
-        base = {"meta": {"a": 1, "b": 2}}
-        patch = {"meta": {"b": None}}
-        result = merge_content(base, patch)
-        assert result["meta"] == {"a": 1}
-
-    def test_replaces_non_object_with_object(self):
-        base = {"field": "string_value"}
-        patch = {"field": {"nested": True}}
-        result = merge_content(base, patch)
-        assert result["field"] == {"nested": True}
-
-    def test_replaces_object_with_non_object(self):
-        base = {"field": {"nested": True}}
-        patch = {"field": "string_value"}
-        result = merge_content(base, patch)
-        assert result["field"] == "string_value"
-
-    def test_empty_patch_preserves_base(self):
-        base = {"a": 1, "b": 2}
-        result = merge_content(base, {})
-        assert result == base
+    @pytest.mark.parametrize(
+        ("base", "patch", "expected"),
+        [
+            pytest.param(
+                {"identity": "I am Kai", "voice": "Warm"},
+                {"slack_id": "U123"},
+                {"identity": "I am Kai", "voice": "Warm", "slack_id": "U123"},
+                id="adds_new_fields",
+            ),
+            pytest.param(
+                {"voice": "Warm", "identity": "Kai"},
+                {"voice": "Formal"},
+                {"voice": "Formal", "identity": "Kai"},
+                id="replaces_string_field",
+            ),
+            pytest.param(
+                {"principles": ["Be kind", "Be honest"]},
+                {"principles": ["Be kind", "Be honest", "Be brave"]},
+                {"principles": ["Be kind", "Be honest", "Be brave"]},
+                id="replaces_array_atomically",
+            ),
+            pytest.param(
+                {"a": 1, "b": 2, "c": 3},
+                {"b": 20},
+                {"a": 1, "b": 20, "c": 3},
+                id="preserves_omitted_fields",
+            ),
+            pytest.param(
+                {"a": 1, "b": 2, "c": 3}, {"b": None}, {"a": 1, "c": 3}, id="null_removes_field"
+            ),
+            pytest.param(
+                {"a": 1}, {"nonexistent": None}, {"a": 1}, id="null_on_missing_field_is_noop"
+            ),
+            pytest.param(
+                {"meta": {"author": "mike", "version": 1}, "name": "test"},
+                {"meta": {"version": 2, "reviewed": True}},
+                {"meta": {"author": "mike", "version": 2, "reviewed": True}, "name": "test"},
+                id="deep_merges_objects",
+            ),
+            pytest.param(
+                {"meta": {"a": 1, "b": 2}},
+                {"meta": {"b": None}},
+                {"meta": {"a": 1}},
+                id="deep_merge_with_null_inside_object",
+            ),
+            pytest.param(
+                {"field": "string_value"},
+                {"field": {"nested": True}},
+                {"field": {"nested": True}},
+                id="replaces_non_object_with_object",
+            ),
+            pytest.param(
+                {"field": {"nested": True}},
+                {"field": "string_value"},
+                {"field": "string_value"},
+                id="replaces_object_with_non_object",
+            ),
+            pytest.param({"a": 1, "b": 2}, {}, {"a": 1, "b": 2}, id="empty_patch_preserves_base"),
+        ],
+    )
+    def test_merge(self, base, patch, expected):
+        assert merge_content(base, patch) == expected
 
     def test_does_not_mutate_base(self):
         base = {"a": 1, "b": {"nested": True}}
@@ -4,12 +4,19 @@ These tests simulate realistic agent workflows exercising the full
 PATCH, regression guard, diff, and restore pipeline through the API.
 """
 
+import asyncio
+
+import pytest
+
+from prompt_forge.core.registry import PromptRegistry
+from tests.conftest import MockSupabaseClient
+
 
 class TestPatchWorkflow:
     """Agent uses PATCH to safely add fields without nuking content."""
 
-    def _setup_persona(self, client):
-        client.post(
+    async def _setup_persona(self, asgi_client):
+        await asgi_client.post(
             "/api/v1/prompts",
             json={
                 "slug": "kai-soul",
@@ -25,7 +32,7 @@ class TestPatchWorkflow:
             "constraints": ["No medical advice", "No legal advice"],
             "capabilities": "Deep conversation, emotional support, creative writing.",
         }
-        resp = client.post(
+        resp = await asgi_client.post(
             "/api/v1/prompts/kai-soul/versions",
             json={
                 "content": content,
@@ -36,11 +43,11 @@ class TestPatchWorkflow:
         assert resp.status_code == 201
         return content
 
-    def test_agent_adds_slack_fields_via_patch(self, client):
+    async def test_agent_adds_slack_fields_via_patch(self, asgi_client):
         """An agent adds Slack config without touching the soul fields."""
-        original = self._setup_persona(client)
+        original = await self._setup_persona(asgi_client)
 
-        resp = client.patch(
+        resp = await asgi_client.patch(
             "/api/v1/prompts/kai-soul/versions",
             json={
                 "content": {
@@ -64,11 +71,11 @@ class TestPatchWorkflow:
         assert v2["content"]["slack_identity"] == "Slack User ID: U0AE9ME4SNB"
         assert v2["content"]["slack_rules"] == "Always append footer with emoji."
 
-    def test_multiple_patches_accumulate(self, client):
+    async def test_multiple_patches_accumulate(self, asgi_client):
         """Multiple PATCH calls accumulate fields."""
-        self._setup_persona(client)
+        await self._setup_persona(asgi_client)
 
-        client.patch(
+        await asgi_client.patch(
             "/api/v1/prompts/kai-soul/versions",
             json={
                 "content": {"slack_identity": "U123"},
@@ -76,7 +83,7 @@ class TestPatchWorkflow:
                 "author": "kai",
             },
         )
-        resp = client.patch(
+        resp = await asgi_client.patch(
             "/api/v1/prompts/kai-soul/versions",
             json={
                 "content": {"discord_identity": "kai#1234"},
@@ -91,11 +98,11 @@ class TestPatchWorkflow:
         assert "slack_identity" in v3["content"]
         assert "discord_identity" in v3["content"]
 
-    def test_patch_updates_existing_field(self, client):
+    async def test_patch_updates_existing_field(self, asgi_client):
         """PATCH can update a field's value."""
-        self._setup_persona(client)
+        await self._setup_persona(asgi_client)
 
-        resp = client.patch(
+        resp = await asgi_client.patch(
             "/api/v1/prompts/kai-soul/versions",
             json={
                 "content": {"voice": "Formal and precise. Avoids metaphors."},
@@ -107,9 +114,9 @@ class TestPatchWorkflow:
         assert resp.json()["content"]["voice"] == "Formal and precise. Avoids metaphors."
         assert resp.json()["content"]["identity"].startswith("You are Kai")
 
-    def test_patch_no_versions_returns_404(self, client):
+    async def test_patch_no_versions_returns_404(self, asgi_client):
         """PATCH on a prompt with no versions gives clear error."""
-        client.post(
+        await asgi_client.post(
             "/api/v1/prompts",
             json={
                 "slug": "empty-prompt",
@@ -117,7 +124,7 @@ class TestPatchWorkflow:
                 "type": "persona",
             },
         )
-        resp = client.patch(
+        resp = await asgi_client.patch(
             "/api/v1/prompts/empty-prompt/versions",
             json={
                 "content": {"a": "b"},
@@ -128,40 +135,41 @@ class TestPatchWorkflow:
         assert "use post" in resp.json()["detail"].lower()
 
 
+_GUARDED_CONTENT = {
+    "identity": "Deep identity description " * 10,
+    "voice": "Voice style " * 10,
+    "personality": "Personality traits " * 10,
+    "principles": ["P1", "P2", "P3", "P4", "P5"],
+    "constraints": ["C1", "C2", "C3"],
+    "capabilities": "Many capabilities " * 10,
+}
+
+
+@pytest.fixture(scope="class")
+def _guarded_baseline():
+    """The 'guarded' prompt with ``_GUARDED_CONTENT`` as v1, seeded once and snapshotted."""
+    db = MockSupabaseClient()
+    PromptRegistry(db).create_prompt(
+        slug="guarded",
+        name="Guarded",
+        type="persona",
+        content=_GUARDED_CONTENT,
+        initial_message="v1",
+    )
+    return db.snapshot()
+
+
+@pytest.fixture
+def guarded(_guarded_baseline, mock_db):
+    """Restore the seeded 'guarded' prompt into the app's database."""
+    mock_db.restore(_guarded_baseline)
+
+
 class TestRegressionGuardE2E:
     """Regression guard prevents accidental content loss end-to-end."""
 
-    def _setup_with_content(self, client):
-        client.post(
-            "/api/v1/prompts",
-            json={
-                "slug": "guarded",
-                "name": "Guarded",
-                "type": "persona",
-            },
-        )
-        content = {
-            "identity": "Deep identity description " * 10,
-            "voice": "Voice style " * 10,
-            "personality": "Personality traits " * 10,
-            "principles": ["P1", "P2", "P3", "P4", "P5"],
-            "constraints": ["C1", "C2", "C3"],
-            "capabilities": "Many capabilities " * 10,
-        }
-        client.post(
-            "/api/v1/prompts/guarded/versions",
-            json={
-                "content": content,
-                "message": "v1",
-                "author": "mike",
-            },
-        )
-        return content
-
-    def test_post_with_missing_fields_blocked(self, client):
+    def test_post_with_missing_fields_blocked(self, client, guarded):
         """POST that drops most fields is blocked."""
-        self._setup_with_content(client)
-
         resp = client.post(
             "/api/v1/prompts/guarded/versions",
             json={
@@ -176,10 +184,8 @@ class TestRegressionGuardE2E:
         assert "keys_removed" in detail["diff"]
         assert len(detail["diff"]["keys_removed"]) >= 5
 
-    def test_post_with_acknowledge_bypasses_block(self, client):
+    def test_post_with_acknowledge_bypasses_block(self, client, guarded):
         """POST with acknowledge_reduction: true bypasses the guard."""
-        self._setup_with_content(client)
-
         resp = client.post(
             "/api/v1/prompts/guarded/versions",
             json={
@@ -242,10 +248,8 @@ class TestRegressionGuardE2E:
         assert resp.status_code == 201
         assert resp.json()["warnings"] is None
 
-    def test_block_response_includes_diff_details(self, client):
+    def test_block_response_includes_diff_details(self, client, guarded):
         """The 409 response includes actionable diff information."""
-        self._setup_with_content(client)
-
         resp = client.post(
             "/api/v1/prompts/guarded/versions",
             json={
@@ -427,7 +431,7 @@ class TestRestoreE2E:
 class TestFullAgentWorkflow:
     """End-to-end: simulate the exact scenario from the spec."""
 
-    def test_spec_scenario(self, client):
+    async def test_spec_scenario(self, asgi_client):
         """
         1. Mike creates persona with full soul (v1)
         2. Agent adds Slack fields via PATCH (v2) — soul preserved
@@ -436,7 +440,7 @@ class TestFullAgentWorkflow:
         5. Agent patches voice update (v3) — everything still intact
         """
         # Step 1: Create full persona
-        client.post(
+        await asgi_client.post(
             "/api/v1/prompts",
             json={
                 "slug": "kai",
@@ -452,7 +456,7 @@ class TestFullAgentWorkflow:
             "constraints": ["No medical advice", "No legal advice", "No financial advice"],
             "capabilities": "Deep conversation, emotional support, creative writing.",
         }
-        r1 = client.post(
+        r1 = await asgi_client.post(
             "/api/v1/prompts/kai/versions",
             json={
                 "content": soul,
@@ -464,7 +468,7 @@ class TestFullAgentWorkflow:
         assert r1.json()["version"] == 1
 
         # Step 2: Agent PATCHes in Slack fields
-        r2 = client.patch(
+        r2 = await asgi_client.patch(
             "/api/v1/prompts/kai/versions",
             json={
                 "content": {
@@ -486,22 +490,25 @@ class TestFullAgentWorkflow:
         assert "slack_identity" in v2_content
 
         # Step 3: Bad agent tries full POST with only Slack fields
-        r3 = client.post(
-            "/api/v1/prompts/kai/versions",
-            json={
-                "content": {
-                    "slack_identity": "Slack User ID: U0AE9ME4SNB",
-                    "slack_rules": "Always append footer with kaomoji.",
+        # Step 4: Diff v1 vs v2 — only additions, no removals
+        # The blocked POST writes nothing, so both requests can run concurrently
+        r3, r4 = await asyncio.gather(
+            asgi_client.post(
+                "/api/v1/prompts/kai/versions",
+                json={
+                    "content": {
+                        "slack_identity": "Slack User ID: U0AE9ME4SNB",
+                        "slack_rules": "Always append footer with kaomoji.",
+                    },
+                    "message": "Updating Slack config",
+                    "author": "bad-agent",
                 },
-                "message": "Updating Slack config",
-                "author": "bad-agent",
-            },
+            ),
+            asgi_client.get("/api/v1/prompts/kai/versions/1/diff/2"),
         )
         assert r3.status_code == 409
         assert r3.json()["detail"]["error"] == "content_regression_blocked"
 
-        # Step 4: Diff v1 vs v2 — only additions, no removals
-        r4 = client.get("/api/v1/prompts/kai/versions/1/diff/2")
         assert r4.status_code == 200
         diff = r4.json()
         actions = {c["field"]: c["action"] for c in diff["changes"]}
@@ -511,7 +518,7 @@ class TestFullAgentWorkflow:
         assert diff["summary"]["added"] == 2
 
         # Step 5: Agent patches a voice update
-        r5 = client.patch(
+        r5 = await asgi_client.patch(
             "/api/v1/prompts/kai/versions",
             json={
                 "content": {"voice": "Formal and precise. Avoids colloquialisms."},